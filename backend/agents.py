@@ -4,14 +4,19 @@ Demonstrates agentic workflows with hallucination prevention
 """
 
 import json
+import operator
 import re
-from typing import TypedDict, Annotated, List, Dict
+import time
+from functools import lru_cache, wraps
+from typing import TypedDict, Annotated, List, Dict, Optional
 from langchain_groq import ChatGroq
 from langchain_core.messages import HumanMessage, SystemMessage
 from langgraph.graph import StateGraph, END
-from langgraph.graph.message import add_messages
 import os
 from dotenv import load_dotenv
+from statutes import StatuteCode, statute_db, resolve_section
+from grounding import check_grounding
+from profiling import profile_node
 
 load_dotenv()
 
@@ -22,366 +27,17 @@ llm = ChatGroq(
     groq_api_key=os.getenv("GROQ_API_KEY")
 )
 
-# Comprehensive IPC Database - Real Indian Penal Code Sections
-VALID_IPC_DATABASE = {
-    # Offenses Against the State
-    '121': {
-        'name': 'Waging war against Government of India',
-        'severity': 'Critical',
-        'category': 'Against State',
-        'punishment': 'Death or Life imprisonment',
-        'bailable': False,
-        'related': ['121A', '122', '123']
-    },
-    '124A': {
-        'name': 'Sedition',
-        'severity': 'High',
-        'category': 'Against State',
-        'punishment': 'Life imprisonment or 3 years',
-        'bailable': False,
-        'related': ['121', '153A']
-    },
-    
-    # Offenses Against Human Body - Murder & Culpable Homicide
-    '302': {
-        'name': 'Murder',
-        'severity': 'Critical',
-        'category': 'Against Body',
-        'punishment': 'Death or Life imprisonment',
-        'bailable': False,
-        'related': ['300', '304', '307']
-    },
-    '304': {
-        'name': 'Culpable homicide not amounting to murder',
-        'severity': 'High',
-        'category': 'Against Body',
-        'punishment': 'Life imprisonment or 10 years',
-        'bailable': False,
-        'related': ['299', '302', '304A']
-    },
-    '304A': {
-        'name': 'Causing death by negligence',
-        'severity': 'Medium',
-        'category': 'Against Body',
-        'punishment': '2 years or fine',
-        'bailable': True,
-        'related': ['304', '337', '338']
-    },
-    '307': {
-        'name': 'Attempt to murder',
-        'severity': 'High',
-        'category': 'Against Body',
-        'punishment': '10 years or Life imprisonment',
-        'bailable': False,
-        'related': ['302', '308', '326']
-    },
-    '308': {
-        'name': 'Attempt to commit culpable homicide',
-        'severity': 'High',
-        'category': 'Against Body',
-        'punishment': '3 years or fine',
-        'bailable': True,
-        'related': ['304', '307']
-    },
-    
-    # Hurt & Grievous Hurt
-    '323': {
-        'name': 'Voluntarily causing hurt',
-        'severity': 'Low',
-        'category': 'Against Body',
-        'punishment': '1 year or fine',
-        'bailable': True,
-        'related': ['324', '325', '352']
-    },
-    '324': {
-        'name': 'Voluntarily causing hurt by dangerous weapons',
-        'severity': 'Medium',
-        'category': 'Against Body',
-        'punishment': '3 years or fine',
-        'bailable': True,
-        'related': ['323', '326', '327']
-    },
-    '325': {
-        'name': 'Voluntarily causing grievous hurt',
-        'severity': 'Medium',
-        'category': 'Against Body',
-        'punishment': '7 years and fine',
-        'bailable': False,
-        'related': ['320', '326', '338']
-    },
-    '326': {
-        'name': 'Voluntarily causing grievous hurt by dangerous weapons',
-        'severity': 'High',
-        'category': 'Against Body',
-        'punishment': 'Life imprisonment or 10 years',
-        'bailable': False,
-        'related': ['325', '307', '327']
-    },
-    
-    # Wrongful Restraint & Confinement
-    '342': {
-        'name': 'Wrongful confinement',
-        'severity': 'Low',
-        'category': 'Against Body',
-        'punishment': '1 year or fine',
-        'bailable': True,
-        'related': ['340', '343', '344']
-    },
-    '354': {
-        'name': 'Assault or criminal force to woman with intent to outrage her modesty',
-        'severity': 'High',
-        'category': 'Against Women',
-        'punishment': '2 years or fine',
-        'bailable': False,
-        'related': ['354A', '354B', '509']
-    },
-    '354A': {
-        'name': 'Sexual harassment',
-        'severity': 'High',
-        'category': 'Against Women',
-        'punishment': '3 years or fine',
-        'bailable': False,
-        'related': ['354', '354B', '509']
-    },
-    '354B': {
-        'name': 'Assault or use of criminal force to woman with intent to disrobe',
-        'severity': 'High',
-        'category': 'Against Women',
-        'punishment': '3-7 years and fine',
-        'bailable': False,
-        'related': ['354', '354A', '376']
-    },
-    
-    # Sexual Offenses
-    '375': {
-        'name': 'Rape',
-        'severity': 'Critical',
-        'category': 'Sexual Offenses',
-        'punishment': '7 years to Life imprisonment',
-        'bailable': False,
-        'related': ['376', '376A', '376B']
-    },
-    '376': {
-        'name': 'Punishment for rape',
-        'severity': 'Critical',
-        'category': 'Sexual Offenses',
-        'punishment': '10 years to Life imprisonment',
-        'bailable': False,
-        'related': ['375', '376A', '376D']
-    },
-    '376A': {
-        'name': 'Punishment for causing death or persistent vegetative state of victim',
-        'severity': 'Critical',
-        'category': 'Sexual Offenses',
-        'punishment': '20 years to Life or Death',
-        'bailable': False,
-        'related': ['376', '376D']
-    },
-    '376D': {
-        'name': 'Gang rape',
-        'severity': 'Critical',
-        'category': 'Sexual Offenses',
-        'punishment': '20 years to Life imprisonment',
-        'bailable': False,
-        'related': ['376', '376A']
-    },
-    
-    # Theft
-    '378': {
-        'name': 'Theft',
-        'severity': 'Low',
-        'category': 'Property',
-        'punishment': '3 years or fine',
-        'bailable': True,
-        'related': ['379', '380', '381']
-    },
-    '379': {
-        'name': 'Punishment for theft',
-        'severity': 'Low',
-        'category': 'Property',
-        'punishment': '3 years or fine',
-        'bailable': True,
-        'related': ['378', '380', '381']
-    },
-    '380': {
-        'name': 'Theft in dwelling house',
-        'severity': 'Medium',
-        'category': 'Property',
-        'punishment': '7 years and fine',
-        'bailable': False,
-        'related': ['379', '381', '457']
-    },
-    '381': {
-        'name': 'Theft by clerk or servant',
-        'severity': 'Medium',
-        'category': 'Property',
-        'punishment': '7 years and fine',
-        'bailable': False,
-        'related': ['379', '380', '408']
-    },
-    
-    # Robbery & Dacoity
-    '392': {
-        'name': 'Robbery',
-        'severity': 'High',
-        'category': 'Property',
-        'punishment': '10 years and fine',
-        'bailable': False,
-        'related': ['390', '393', '394']
-    },
-    '395': {
-        'name': 'Dacoity',
-        'severity': 'High',
-        'category': 'Property',
-        'punishment': 'Life imprisonment or 10 years',
-        'bailable': False,
-        'related': ['391', '396', '397']
-    },
-    '396': {
-        'name': 'Dacoity with murder',
-        'severity': 'Critical',
-        'category': 'Property',
-        'punishment': 'Death or Life imprisonment',
-        'bailable': False,
-        'related': ['302', '395', '397']
-    },
-    
-    # Criminal Breach of Trust & Cheating
-    '405': {
-        'name': 'Criminal breach of trust',
-        'severity': 'Medium',
-        'category': 'Property',
-        'punishment': '3 years or fine',
-        'bailable': True,
-        'related': ['406', '408', '409']
-    },
-    '406': {
-        'name': 'Punishment for criminal breach of trust',
-        'severity': 'Medium',
-        'category': 'Property',
-        'punishment': '3 years or fine',
-        'bailable': True,
-        'related': ['405', '408', '420']
-    },
-    '408': {
-        'name': 'Criminal breach of trust by clerk or servant',
-        'severity': 'Medium',
-        'category': 'Property',
-        'punishment': '7 years and fine',
-        'bailable': False,
-        'related': ['405', '406', '409']
-    },
-    '409': {
-        'name': 'Criminal breach of trust by public servant',
-        'severity': 'High',
-        'category': 'Property',
-        'punishment': 'Life imprisonment or 10 years',
-        'bailable': False,
-        'related': ['405', '408', '477A']
-    },
-    '420': {
-        'name': 'Cheating and dishonestly inducing delivery of property',
-        'severity': 'Medium',
-        'category': 'Property',
-        'punishment': '7 years and fine',
-        'bailable': False,
-        'related': ['415', '417', '419']
-    },
-    '467': {
-        'name': 'Forgery of valuable security, will, etc.',
-        'severity': 'High',
-        'category': 'Property',
-        'punishment': 'Life imprisonment or 10 years',
-        'bailable': False,
-        'related': ['463', '468', '471']
-    },
-    '468': {
-        'name': 'Forgery for purpose of cheating',
-        'severity': 'Medium',
-        'category': 'Property',
-        'punishment': '7 years and fine',
-        'bailable': False,
-        'related': ['463', '467', '471']
-    },
-    
-    # Offenses Against Women & Marriage
-    '493': {
-        'name': 'Cohabitation caused by man deceitfully inducing belief of lawful marriage',
-        'severity': 'Medium',
-        'category': 'Against Women',
-        'punishment': '10 years and fine',
-        'bailable': False,
-        'related': ['494', '495', '498A']
-    },
-    '494': {
-        'name': 'Marrying again during lifetime of husband or wife',
-        'severity': 'Medium',
-        'category': 'Against Women',
-        'punishment': '7 years and fine',
-        'bailable': False,
-        'related': ['493', '495']
-    },
-    '498A': {
-        'name': 'Husband or relative of husband subjecting woman to cruelty',
-        'severity': 'High',
-        'category': 'Against Women',
-        'punishment': '3 years and fine',
-        'bailable': False,
-        'related': ['304B', '306', '494']
-    },
-    '304B': {
-        'name': 'Dowry death',
-        'severity': 'Critical',
-        'category': 'Against Women',
-        'punishment': '7 years to Life imprisonment',
-        'bailable': False,
-        'related': ['498A', '302', '306']
-    },
-    
-    # Defamation
-    '499': {
-        'name': 'Defamation',
-        'severity': 'Low',
-        'category': 'Defamation',
-        'punishment': '2 years or fine',
-        'bailable': True,
-        'related': ['500', '501']
-    },
-    '500': {
-        'name': 'Punishment for defamation',
-        'severity': 'Low',
-        'category': 'Defamation',
-        'punishment': '2 years or fine',
-        'bailable': True,
-        'related': ['499', '501']
-    },
-    
-    # Insult & Annoyance
-    '504': {
-        'name': 'Intentional insult with intent to provoke breach of peace',
-        'severity': 'Low',
-        'category': 'Public Tranquility',
-        'punishment': '2 years or fine',
-        'bailable': True,
-        'related': ['503', '506', '509']
-    },
-    '506': {
-        'name': 'Criminal intimidation',
-        'severity': 'Low',
-        'category': 'Public Tranquility',
-        'punishment': '2 years or fine',
-        'bailable': True,
-        'related': ['503', '504', '507']
-    },
-    '509': {
-        'name': 'Word, gesture or act intended to insult modesty of woman',
-        'severity': 'Medium',
-        'category': 'Against Women',
-        'punishment': '3 years and fine',
-        'bailable': True,
-        'related': ['354', '354A', '504']
-    }
-}
+# Same model without client retries, used when a request has a deadline so
+# one call is a single attempt bounded by the time remaining
+deadline_llm = ChatGroq(
+    model="llama-3.1-8b-instant",
+    temperature=0.1,
+    groq_api_key=os.getenv("GROQ_API_KEY"),
+    max_retries=0
+)
+
+# Trusted statute catalogue (IPC, BNS, CrPC) - served lazily from data/statutes.db
+VALID_IPC_DATABASE = StatuteCode(statute_db, 'IPC')
 
 # Helper function to get IPC section list
 def get_valid_ipc_sections() -> List[str]:
@@ -389,20 +45,168 @@ def get_valid_ipc_sections() -> List[str]:
     return list(VALID_IPC_DATABASE.keys())
 
 
-# Define the state structure for the agent workflow
+# Define the state structure for the agent workflow.
+# Nodes read the state but return only the keys they produce, so LangGraph
+# updates just those channels instead of rewriting the whole state each step.
 class AgentState(TypedDict):
     """State passed between agents in the workflow"""
     case_description: str
     extraction: dict
+    grounding: dict
     draft: str
     verification: dict
     risk: dict
-    messages: Annotated[list, add_messages]
-    reasoning: dict  # NEW: Store reasoning traces
+    deadline: Optional[float]  # time.monotonic() value after which nodes are skipped
+    skipped_nodes: Annotated[list, operator.add]
+    trusted_fields: list  # extraction fields edited by the user, accepted without grounding
+
+
+# Nodes are skipped when less than this many seconds remain before the deadline
+MIN_NODE_BUDGET = float(os.getenv("MIN_NODE_BUDGET", 0.5))
+
+
+def remaining_time(state: AgentState) -> Optional[float]:
+    """Seconds left before the request deadline, or None when there is none"""
+    deadline = state.get("deadline")
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def invoke_llm(state: AgentState, messages: list):
+    """
+    Call the LLM, bounded by the request deadline when there is one
+
+    The default client retries failed calls, which would let a call run
+    to several times the remaining budget, so deadline-bound calls use the
+    no-retry client with the remaining time as its timeout.
+    """
+    remaining = remaining_time(state)
+    if remaining is None:
+        return llm.invoke(messages)
+    return deadline_llm.invoke(messages, timeout=max(remaining, MIN_NODE_BUDGET))
+
+
+def with_deadline(node_name: str, fallback):
+    """
+    Wrap an agent so it is skipped once the request deadline has passed
+
+    A skipped node returns its fallback output instead so downstream nodes
+    and the response still have well-formed data, and its name is appended
+    to state["skipped_nodes"].
+    """
+    def decorator(agent):
+        @wraps(agent)
+        def wrapper(state: AgentState) -> dict:
+            remaining = remaining_time(state)
+            if remaining is not None and remaining < MIN_NODE_BUDGET:
+                print(f"⏱️  Deadline reached - skipping {node_name}")
+                return {**fallback(state), "skipped_nodes": [node_name]}
+            return agent(state)
+        return wrapper
+    return decorator
+
+
+def as_text(value) -> Optional[str]:
+    """Coerce an LLM-extracted value to text (e.g. 32 -> "32", lists joined)"""
+    if value is None:
+        return None
+    if isinstance(value, (list, tuple)):
+        return ", ".join(str(item) for item in value if item is not None) or None
+    if isinstance(value, dict):
+        return json.dumps(value, ensure_ascii=False)
+    return str(value)
+
+
+def as_section_list(value) -> List[str]:
+    """Coerce LLM-extracted IPC sections to a list of strings"""
+    if value is None:
+        return []
+    if isinstance(value, (str, int, float)):
+        value = str(value).split(",")
+    return [str(sec).strip() for sec in value if sec is not None and str(sec).strip()]
+
+
+# Placeholders written by the agents when the LLM call fails
+EXTRACTION_FAILED = "[Extraction Failed]"
+DRAFT_FAILED_MARKER = "[Draft generation failed - using fallback template]"
+
+
+def fallback_extraction(accused_name: str) -> dict:
+    """Extraction result used when the intake agent cannot produce one"""
+    return {
+        "accusedName": accused_name,
+        "age": None,
+        "address": None,
+        "ipcSections": [],
+        "location": "[Unknown]",
+        "policeStation": "[Unknown]",
+        "offenseType": "[Unknown]",
+        "firNumber": None,
+        "firDate": None,
+        "complainant": None,
+        "propertyValue": None,
+        "evidence": None,
+        "arrestStatus": None
+    }
+
+
+def fallback_draft(extraction: dict) -> str:
+    """Template bail application used when the drafting agent cannot run"""
+    return f"""IN THE COURT OF SESSIONS JUDGE, DELHI
+Bail Application under Section 439 CrPC
+
+Accused: {extraction['accusedName']}
+
+{DRAFT_FAILED_MARKER}
+
+The present bail application is filed on behalf of {extraction['accusedName']} 
+in connection with FIR registered at {extraction['policeStation']} 
+under Section {', '.join(extraction['ipcSections'])} IPC.
+
+The alleged incident occurred at {extraction['location']}.
+
+PRAYER:
+It is respectfully prayed that this Hon'ble Court grant bail to the accused 
+in the interest of justice."""
+
+
+def _skip_intake(state: AgentState) -> dict:
+    return {"extraction": fallback_extraction("[Skipped - Deadline Exceeded]")}
+
+
+def _skip_grounding(state: AgentState) -> dict:
+    return {"grounding": {}}
+
+
+def _skip_drafting(state: AgentState) -> dict:
+    return {"draft": fallback_draft(state["extraction"])}
+
+
+def _skip_verification(state: AgentState) -> dict:
+    return {"verification": {
+        "isValid": False,
+        "message": "Verification skipped - request deadline exceeded",
+        "validSections": [],
+        "invalidSections": [],
+        "unverifiedSections": [],
+        "reliabilityScore": 0,
+        "validDetails": []
+    }}
+
+
+def _skip_risk_scoring(state: AgentState) -> dict:
+    return {"risk": {
+        "score": 0,
+        "level": "Unknown",
+        "maxSeverity": "Unknown"
+    }}
 
 
 # Agent 1: Case Intake - Extract structured data
-def case_intake_agent(state: AgentState) -> AgentState:
+@with_deadline("intake", _skip_intake)
+@profile_node("intake")
+def case_intake_agent(state: AgentState) -> dict:
     """Extract structured data from unstructured FIR text using LLM"""
     print("🤖 Agent 1: Case Intake - Extracting structured data...")
     
@@ -439,58 +243,66 @@ Return only JSON with all available fields."""
             HumanMessage(content=user_prompt)
         ]
         
-        response = llm.invoke(messages)
+        response = invoke_llm(state, messages)
         response_text = response.content
         
         # Clean up response
         cleaned = response_text.replace('```json', '').replace('```', '').strip()
-        extraction = json.loads(cleaned)
+        parsed = json.loads(cleaned)
         
-        state["extraction"] = {
-            "accusedName": extraction.get("accusedName", "[Unknown]"),
-            "age": extraction.get("age"),
-            "address": extraction.get("address"),
-            "ipcSections": extraction.get("ipcSections", []),
-            "location": extraction.get("location", "[Unknown]"),
-            "policeStation": extraction.get("policeStation", "[Unknown]"),
-            "offenseType": extraction.get("offenseType", "[Unknown]"),
-            "firNumber": extraction.get("firNumber"),
-            "firDate": extraction.get("firDate"),
-            "complainant": extraction.get("complainant"),
-            "propertyValue": extraction.get("propertyValue"),
-            "evidence": extraction.get("evidence"),
-            "arrestStatus": extraction.get("arrestStatus")
+        extraction = {
+            "accusedName": as_text(parsed.get("accusedName")) or "[Unknown]",
+            "age": as_text(parsed.get("age")),
+            "address": as_text(parsed.get("address")),
+            "ipcSections": as_section_list(parsed.get("ipcSections")),
+            "location": as_text(parsed.get("location")) or "[Unknown]",
+            "policeStation": as_text(parsed.get("policeStation")) or "[Unknown]",
+            "offenseType": as_text(parsed.get("offenseType")) or "[Unknown]",
+            "firNumber": as_text(parsed.get("firNumber")),
+            "firDate": as_text(parsed.get("firDate")),
+            "complainant": as_text(parsed.get("complainant")),
+            "propertyValue": as_text(parsed.get("propertyValue")),
+            "evidence": as_text(parsed.get("evidence")),
+            "arrestStatus": as_text(parsed.get("arrestStatus"))
         }
         
-        print(f"✅ Extracted: {state['extraction']['accusedName']}, IPC: {state['extraction']['ipcSections']}")
-        if state['extraction'].get('firNumber'):
-            print(f"   FIR: {state['extraction']['firNumber']}")
-        if state['extraction'].get('propertyValue'):
-            print(f"   Property Value: {state['extraction']['propertyValue']}")
+        print(f"✅ Extracted: {extraction['accusedName']}, IPC: {extraction['ipcSections']}")
+        if extraction.get('firNumber'):
+            print(f"   FIR: {extraction['firNumber']}")
+        if extraction.get('propertyValue'):
+            print(f"   Property Value: {extraction['propertyValue']}")
         
     except Exception as e:
         print(f"❌ Extraction error: {e}")
-        state["extraction"] = {
-            "accusedName": "[Extraction Failed]",
-            "age": None,
-            "address": None,
-            "ipcSections": [],
-            "location": "[Unknown]",
-            "policeStation": "[Unknown]",
-            "offenseType": "[Unknown]",
-            "firNumber": None,
-            "firDate": None,
-            "complainant": None,
-            "propertyValue": None,
-            "evidence": None,
-            "arrestStatus": None
-        }
+        extraction = fallback_extraction(EXTRACTION_FAILED)
+    
+    return {"extraction": extraction}
+
+
+# Grounding - Deterministic check of the extraction against the FIR text
+@with_deadline("grounding_check", _skip_grounding)
+@profile_node("grounding_check")
+def grounding_agent(state: AgentState) -> dict:
+    """Flag extracted sections and fields that do not appear in the FIR"""
+    print("🧭 Grounding - Checking extraction against FIR text...")
+    
+    grounding = check_grounding(
+        state["case_description"], state["extraction"], state.get("trusted_fields") or ()
+    )
+    
+    if grounding["isGrounded"]:
+        print(f"✅ All extracted values found in FIR")
+    else:
+        print(f"⚠️  Ungrounded sections: {grounding['ungroundedSections']}, "
+              f"fields: {grounding['ungroundedFields']}")
     
-    return state
+    return {"grounding": grounding}
 
 
 # Agent 2: Drafting - Generate bail application
-def drafting_agent(state: AgentState) -> AgentState:
+@with_deadline("drafting", _skip_drafting)
+@profile_node("drafting")
+def drafting_agent(state: AgentState) -> dict:
     """Generate professional bail application using LLM"""
     print("✍️  Agent 2: Drafting - Generating bail application...")
     
@@ -518,70 +330,76 @@ Format the application professionally."""
             HumanMessage(content=user_prompt)
         ]
         
-        response = llm.invoke(messages)
-        state["draft"] = response.content
+        response = invoke_llm(state, messages)
+        draft = response.content
         
-        print(f"✅ Draft generated ({len(state['draft'])} characters)")
+        print(f"✅ Draft generated ({len(draft)} characters)")
         
     except Exception as e:
         print(f"❌ Drafting error: {e}")
-        state["draft"] = f"""IN THE COURT OF SESSIONS JUDGE, DELHI
-Bail Application under Section 439 CrPC
-
-Accused: {extraction['accusedName']}
-
-[Draft generation failed - using fallback template]
-
-The present bail application is filed on behalf of {extraction['accusedName']} 
-in connection with FIR registered at {extraction['policeStation']} 
-under Section {', '.join(extraction['ipcSections'])} IPC.
-
-The alleged incident occurred at {extraction['location']}.
-
-PRAYER:
-It is respectfully prayed that this Hon'ble Court grant bail to the accused 
-in the interest of justice."""
+        draft = fallback_draft(extraction)
     
-    return state
+    return {"draft": draft}
 
 
 # Agent 3: Citation Verification - Anti-hallucination layer
-def verification_agent(state: AgentState) -> AgentState:
-    """Verify citations against deterministic IPC database"""
+@with_deadline("citation_check", _skip_verification)
+@profile_node("citation_check")
+def verification_agent(state: AgentState) -> dict:
+    """Verify citations against the deterministic statute database"""
     print("🔍 Agent 3: Verification - Checking for hallucinations...")
     
     draft = state["draft"]
     
-    # Extract all IPC sections from the draft using regex
-    ipc_regex = r'Section\s+(\d+[A-Z]*)\s+IPC'
-    matches = re.findall(ipc_regex, draft, re.IGNORECASE)
-    extracted_sections = list(set(matches))  # Remove duplicates
-    
-    # Validate IPC sections against deterministic database
-    valid_sections = [sec for sec in extracted_sections if sec in VALID_IPC_DATABASE]
-    invalid_sections = [sec for sec in extracted_sections if sec not in VALID_IPC_DATABASE]
+    # Extract all IPC/BNS/CrPC citations from the draft using regex.
+    # IPC sections are labelled by number alone, others as "103 BNS".
+    citation_regex = r'Section\s+(\d+[A-Z]*)\s+(IPC|BNS|CrPC)\b'
+    matches = re.findall(citation_regex, draft, re.IGNORECASE)
+    citations = {}
+    for sec, code in matches:
+        code = 'CrPC' if code.lower() == 'crpc' else code.upper()
+        sec = sec.upper()
+        label = sec if code == 'IPC' else f"{sec} {code}"
+        citations[label] = (code, sec)  # Remove duplicates
+    
+    # Validate citations against deterministic database. Sections of a
+    # partly catalogued code (BNS, CrPC) that may exist are left unverified.
+    status = {label: statute_db.verify(*key) for label, key in citations.items()}
+    valid_sections = [label for label, found in status.items() if found]
+    invalid_sections = [label for label, found in status.items() if found is False]
+    unverified_sections = [label for label, found in status.items() if found is None]
     
     is_valid = len(invalid_sections) == 0
     reliability_score = 100 if is_valid else 60
     
     # Get details for valid sections
     valid_details = []
-    for sec in valid_sections:
-        if sec in VALID_IPC_DATABASE:
-            info = VALID_IPC_DATABASE[sec]
-            valid_details.append({
-                'section': sec,
-                'name': info['name'],
-                'severity': info['severity'],
-                'category': info['category']
-            })
-    
-    state["verification"] = {
+    for label in valid_sections:
+        info = statute_db.get(*citations[label])
+        valid_details.append({
+            'section': label,
+            'name': info['name'],
+            'severity': info['severity'],
+            'category': info['category']
+        })
+    
+    def citation_text(label: str) -> str:
+        return f"Section {label}" + (" IPC" if citations[label][0] == 'IPC' else "")
+    
+    if not is_valid:
+        message = f"Hallucinated Sections Detected: {', '.join(citation_text(label) for label in invalid_sections)}"
+    elif unverified_sections:
+        message = ("No Hallucinated Sections Detected - not in legal database, check manually: "
+                   f"{', '.join(citation_text(label) for label in unverified_sections)}")
+    else:
+        message = "All Cited Sections Verified Against Legal Database"
+    
+    verification = {
         "isValid": is_valid,
-        "message": "All IPC Sections Verified Against Legal Database" if is_valid 
-                   else f"Hallucinated IPC Sections Detected: {', '.join(['Section ' + sec + ' IPC' for sec in invalid_sections])}",
+        "message": message,
         "validSections": valid_sections,
         "invalidSections": invalid_sections,
+        "unverifiedSections": unverified_sections,
         "reliabilityScore": reliability_score,
         "validDetails": valid_details
     }
@@ -591,17 +409,21 @@ def verification_agent(state: AgentState) -> AgentState:
         for detail in valid_details:
             print(f"   • Section {detail['section']}: {detail['name']} ({detail['severity']})")
     else:
-        print(f"⚠️  Hallucination detected - Invalid IPC sections: {invalid_sections}")
+        print(f"⚠️  Hallucination detected - Invalid sections: {invalid_sections}")
     
-    return state
+    return {"verification": verification}
 
 
 # Agent 4: Risk Scoring - Calculate risk based on IPC severity
-def risk_scoring_agent(state: AgentState) -> AgentState:
+@with_deadline("risk_scoring", _skip_risk_scoring)
+@profile_node("risk_scoring")
+def risk_scoring_agent(state: AgentState) -> dict:
     """Calculate risk score based on IPC section severity"""
     print("⚖️  Agent 4: Risk Scoring - Calculating risk level...")
     
-    ipc_sections = state["extraction"]["ipcSections"]
+    # Only score sections actually cited in the FIR when grounding ran
+    grounding = state.get("grounding") or {}
+    ipc_sections = grounding.get("groundedSections", state["extraction"]["ipcSections"])
     
     # Calculate risk based on severity levels in database
     max_severity = "Low"
@@ -622,8 +444,9 @@ def risk_scoring_agent(state: AgentState) -> AgentState:
     }
     
     for sec in ipc_sections:
-        if sec in VALID_IPC_DATABASE:
-            section_severity = VALID_IPC_DATABASE[sec]['severity']
+        info = resolve_section(sec)
+        if info is not None:
+            section_severity = info['severity']
             section_score = severity_scores.get(section_severity, 10)
             
             # Take the highest severity
@@ -641,7 +464,7 @@ def risk_scoring_agent(state: AgentState) -> AgentState:
     else:
         level = "Low"
     
-    state["risk"] = {
+    risk = {
         "score": score,
         "level": level,
         "maxSeverity": max_severity
@@ -649,27 +472,41 @@ def risk_scoring_agent(state: AgentState) -> AgentState:
     
     print(f"✅ Risk Score: {score}% ({level} - {max_severity} severity)")
     
-    return state
+    return {"risk": risk}
 
 
 # Build the LangGraph workflow
-def create_legal_workflow():
-    """Create the multi-agent workflow using LangGraph"""
+@lru_cache(maxsize=None)
+def create_legal_workflow(include_draft: bool = True):
+    """
+    Create the multi-agent workflow using LangGraph
+
+    With include_draft=False the drafting and verification agents are left
+    out, giving a single-LLM-call extraction + risk pipeline used when the
+    server is overloaded. Compiled graphs are stateless, so each variant is
+    built once and shared by all requests.
+    """
     
     # Create the graph
     workflow = StateGraph(AgentState)
     
     # Add nodes (agents)
     workflow.add_node("intake", case_intake_agent)
-    workflow.add_node("drafting", drafting_agent)
-    workflow.add_node("verification", verification_agent)
+    workflow.add_node("grounding_check", grounding_agent)
     workflow.add_node("risk_scoring", risk_scoring_agent)
+    if include_draft:
+        workflow.add_node("drafting", drafting_agent)
+        workflow.add_node("citation_check", verification_agent)
     
     # Define the flow
     workflow.set_entry_point("intake")
-    workflow.add_edge("intake", "drafting")
-    workflow.add_edge("drafting", "verification")
-    workflow.add_edge("verification", "risk_scoring")
+    workflow.add_edge("intake", "grounding_check")
+    if include_draft:
+        workflow.add_edge("grounding_check", "drafting")
+        workflow.add_edge("drafting", "citation_check")
+        workflow.add_edge("citation_check", "risk_scoring")
+    else:
+        workflow.add_edge("grounding_check", "risk_scoring")
     workflow.add_edge("risk_scoring", END)
     
     # Compile the graph
@@ -679,27 +516,50 @@ def create_legal_workflow():
 
 
 # Main function to process a legal case
-async def process_legal_case(case_description: str) -> dict:
-    """Process a legal case through the multi-agent workflow"""
+async def process_legal_case(case_description: str, degraded: bool = False,
+                             deadline: Optional[float] = None) -> dict:
+    """
+    Process a legal case through the multi-agent workflow
+
+    When degraded is True only extraction and risk scoring run; the draft
+    is left empty and verification reports that it was skipped.
+
+    deadline is a time.monotonic() value; nodes reached after it are
+    skipped and LLM calls are given the remaining time as their timeout.
+    """
     print("\n" + "="*60)
-    print("🏛️  LegalFlow AI - Multi-Agent Workflow Starting")
+    print("🏛️  LegalFlow AI - Multi-Agent Workflow Starting" + (" (degraded)" if degraded else ""))
     print("="*60 + "\n")
     
     # Create the workflow
-    app = create_legal_workflow()
+    app = create_legal_workflow(include_draft=not degraded)
     
     # Initial state
     initial_state = {
         "case_description": case_description,
         "extraction": {},
+        "grounding": {},
         "draft": "",
         "verification": {},
         "risk": {},
-        "messages": []
+        "deadline": deadline,
+        "skipped_nodes": [],
+        "trusted_fields": []
     }
     
     # Run the workflow
     final_state = await app.ainvoke(initial_state)
+
+    if degraded:
+        final_state["verification"] = {
+            "isValid": False,
+            "message": "Drafting skipped - server under heavy load, please retry for a full draft",
+            "validSections": [],
+            "invalidSections": [],
+            "unverifiedSections": [],
+            "reliabilityScore": 0,
+            "validDetails": []
+        }
     
     print("\n" + "="*60)
     print("✅ Workflow Complete!")
@@ -708,7 +568,10 @@ async def process_legal_case(case_description: str) -> dict:
     # Return the results
     return {
         "extraction": final_state["extraction"],
+        "grounding": final_state["grounding"] or None,
         "draft": final_state["draft"],
         "verification": final_state["verification"],
-        "risk": final_state["risk"]
+        "risk": final_state["risk"],
+        "degraded": degraded,
+        "skippedNodes": final_state["skipped_nodes"]
     }
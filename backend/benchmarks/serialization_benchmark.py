@@ -0,0 +1,117 @@
+"""
+Serialization benchmark for CaseResponse payloads
+
+Compares the default Pydantic/stdlib JSON path against orjson and the
+compact response mode, and reports compressed sizes on a realistic
+multi-kilobyte bail application draft.
+
+Usage: python benchmarks/serialization_benchmark.py [iterations]
+"""
+
+import gzip
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import orjson
+from agents import VALID_IPC_DATABASE
+from main import CaseResponse, serialize_case_response
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def build_payload() -> dict:
+    """Build a workflow result shaped like a real /api/process-case response"""
+    sections = ['498A', '323', '504', '506', '354', '379', '420']
+    paragraph = (
+        "That the applicant is a law-abiding citizen and has been falsely implicated "
+        "in the present case registered at Rohini Police Station under Section 498A IPC, "
+        "Section 323 IPC, Section 504 IPC and Section 506 IPC. The applicant has deep roots "
+        "in society and there is no likelihood of the applicant absconding or tampering "
+        "with the evidence. The investigation is complete and the applicant is no longer "
+        "required for custodial interrogation.\n\n"
+    )
+    draft = (
+        "IN THE COURT OF SESSIONS JUDGE, DELHI\n"
+        "APPLICATION FOR GRANT OF BAIL UNDER SECTION 439 CRPC\n\n"
+        + paragraph * 14
+        + "PRAYER:\nIt is respectfully prayed that this Hon'ble Court grant bail to the accused."
+    )
+    return {
+        "extraction": {
+            "accusedName": "Suresh Verma s/o Ram Prakash Verma",
+            "age": "32",
+            "address": "Sector 15, Rohini, Delhi",
+            "ipcSections": sections,
+            "location": "Sector 15, Rohini, Delhi",
+            "policeStation": "Rohini Police Station",
+            "offenseType": "Dowry Harassment and Physical Assault",
+            "firNumber": "0089/2022",
+            "firDate": "18th July 2022",
+            "complainant": "Priya Verma",
+            "propertyValue": None,
+            "evidence": "Medical examination showing multiple injuries",
+            "arrestStatus": None,
+        },
+        "draft": draft,
+        "verification": {
+            "isValid": True,
+            "message": "All IPC Sections Verified Against Legal Database",
+            "validSections": sections,
+            "invalidSections": [],
+            "reliabilityScore": 100,
+            "validDetails": [
+                {
+                    "section": sec,
+                    "name": VALID_IPC_DATABASE[sec]['name'],
+                    "severity": VALID_IPC_DATABASE[sec]['severity'],
+                    "category": VALID_IPC_DATABASE[sec]['category'],
+                }
+                for sec in sections
+            ],
+        },
+        "risk": {"score": 75, "level": "High", "maxSeverity": "High"},
+    }
+
+
+def timed(label: str, fn, iterations: int) -> bytes:
+    """Run fn repeatedly and print the mean time per call"""
+    body = fn()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    elapsed = (time.perf_counter() - start) / iterations * 1e6
+    print(f"{label:<34} {elapsed:>9.1f} us  {len(body):>7} bytes")
+    return body
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    payload = build_payload()
+
+    print(f"Serialization ({iterations} iterations)")
+    print("-" * 60)
+    timed("pydantic + json.dumps (baseline)",
+          lambda: json.dumps(CaseResponse.model_validate(payload).model_dump()).encode(), iterations)
+    full = timed("pydantic + orjson (full)",
+                 lambda: orjson.dumps(serialize_case_response(payload)), iterations)
+    compact = timed("pydantic + orjson (compact)",
+                    lambda: orjson.dumps(serialize_case_response(payload, compact=True)), iterations)
+
+    print("\nCompressed sizes")
+    print("-" * 60)
+    for label, body in (("full", full), ("compact", compact)):
+        sizes = f"gzip {len(gzip.compress(body, 6)):>6} bytes"
+        if brotli is not None:
+            sizes += f"  br {len(brotli.compress(body, quality=4)):>6} bytes"
+        print(f"{label:<10} raw {len(body):>6} bytes  {sizes}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,327 @@
+"""
+LegalFlow AI - Offline bulk FIR ingestion
+Streams FIRs from JSONL/CSV through the multi-agent workflow
+
+Usage:
+    python bulk_ingest.py firs.jsonl results.jsonl --workers 4 --rate 2
+    python bulk_ingest.py firs.csv results.db --field description
+
+Records are read lazily and at most `workers * 2` are buffered, so memory
+stays flat regardless of input size. Each input record is identified by
+its position in the file; progress is checkpointed as the highest index
+below which every record has been written, so re-running the same
+command resumes where the previous run stopped.
+
+Records whose workflow failed - an exception, or the agents' fallback
+output after an LLM error or deadline - are written with an "error" and
+counted as done, as are input lines that are not a JSON object. Re-run
+with --retry-failed to process them again.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import csv
+import json
+import os
+import sqlite3
+import sys
+import time
+from typing import Iterator, Optional, Tuple
+
+from agents import process_legal_case, EXTRACTION_FAILED, DRAFT_FAILED_MARKER
+
+
+def read_records(path: str, field: str) -> Iterator[Tuple[int, Optional[str], str, Optional[str]]]:
+    """
+    Yield (index, id, caseDescription, error) for each FIR in a JSONL or CSV file
+
+    A JSONL line that is not a JSON object keeps its index and is yielded
+    with an error instead of a description, so one bad line cannot stop
+    the run or hold back the watermark.
+    """
+    with open(path, newline="", encoding="utf-8") as f:
+        if path.endswith(".csv"):
+            for index, row in enumerate(csv.DictReader(f)):
+                yield index, row.get("id"), row.get(field) or "", None
+            return
+        for index, line in enumerate(line for line in f if line.strip()):
+            try:
+                row = json.loads(line)
+            except ValueError as e:
+                yield index, None, "", f"invalid JSON: {e}"
+                continue
+            if not isinstance(row, dict):
+                yield index, None, "", "record is not a JSON object"
+                continue
+            yield index, row.get("id"), row.get(field) or "", None
+
+
+def failure_reason(result: dict) -> Optional[str]:
+    """Why a workflow result holds fallback output instead of real results, if it does"""
+    if result["extraction"].get("accusedName") == EXTRACTION_FAILED:
+        return "extraction failed"
+    if DRAFT_FAILED_MARKER in result["draft"]:
+        return "drafting failed"
+    if result.get("skippedNodes"):
+        return f"deadline exceeded, skipped {', '.join(result['skippedNodes'])}"
+    return None
+
+
+def count_records(path: str, field: str) -> int:
+    """Count input records with a streaming pass (used for the ETA)"""
+    return sum(1 for _ in read_records(path, field))
+
+
+class JsonlSink:
+    """Appends results as JSON lines with a sidecar checkpoint file"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.checkpoint_path = path + ".checkpoint"
+        self._file = open(path, "a+", encoding="utf-8")
+        # Terminate a line left partly written by a killed run so the next
+        # record does not get appended onto it
+        if self._file.tell():
+            self._file.seek(self._file.tell() - 1)
+            if self._file.read(1) != "\n":
+                self._file.write("\n")
+
+    def load_watermark(self) -> int:
+        if not os.path.exists(self.checkpoint_path):
+            return 0
+        with open(self.checkpoint_path, encoding="utf-8") as f:
+            return int(f.read().strip() or 0)
+
+    def _records(self) -> Iterator[dict]:
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue  # blank, or partly written when the last run was killed
+
+    def completed_from(self, watermark: int) -> set:
+        """Indices >= watermark already written (at most one batch in flight)"""
+        return {record["index"] for record in self._records() if record["index"] >= watermark}
+
+    def failed(self) -> set:
+        """Indices whose latest written result is a failure"""
+        failed = set()
+        for record in self._records():
+            if "error" in record:
+                failed.add(record["index"])
+            else:
+                failed.discard(record["index"])
+        return failed
+
+    def write(self, record: dict):
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._file.flush()
+
+    def save_watermark(self, watermark: int):
+        tmp_path = self.checkpoint_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(str(watermark))
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def close(self):
+        self._file.close()
+
+
+class SqliteSink:
+    """Stores results in a `results` table and the watermark in `progress`"""
+
+    def __init__(self, path: str):
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "idx INTEGER PRIMARY KEY, id TEXT, result TEXT, error TEXT)"
+        )
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS progress (key TEXT PRIMARY KEY, value INTEGER)"
+        )
+        self.conn.commit()
+
+    def load_watermark(self) -> int:
+        row = self.conn.execute("SELECT value FROM progress WHERE key = 'watermark'").fetchone()
+        return row[0] if row else 0
+
+    def completed_from(self, watermark: int) -> set:
+        rows = self.conn.execute("SELECT idx FROM results WHERE idx >= ?", (watermark,))
+        return {row[0] for row in rows}
+
+    def failed(self) -> set:
+        rows = self.conn.execute("SELECT idx FROM results WHERE error IS NOT NULL")
+        return {row[0] for row in rows}
+
+    def write(self, record: dict):
+        result = record.get("result")
+        self.conn.execute(
+            "INSERT OR REPLACE INTO results (idx, id, result, error) VALUES (?, ?, ?, ?)",
+            (
+                record["index"],
+                record.get("id"),
+                json.dumps(result, ensure_ascii=False) if result is not None else None,
+                record.get("error"),
+            )
+        )
+        self.conn.commit()
+
+    def save_watermark(self, watermark: int):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO progress (key, value) VALUES ('watermark', ?)", (watermark,)
+        )
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+
+def open_sink(path: str):
+    """Pick the output backend from the file extension"""
+    if path.endswith((".db", ".sqlite", ".sqlite3")):
+        return SqliteSink(path)
+    return JsonlSink(path)
+
+
+class RateLimiter:
+    """Spaces out workflow starts to at most `rate` per second"""
+
+    def __init__(self, rate: Optional[float]):
+        self.interval = 1.0 / rate if rate else 0.0
+        self._next = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def wait(self):
+        if not self.interval:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            if self._next > now:
+                await asyncio.sleep(self._next - now)
+            self._next = max(now, self._next) + self.interval
+
+
+class Progress:
+    """Tracks the contiguous completion watermark and prints throughput/ETA"""
+
+    def __init__(self, watermark: int, already_done: set, total: Optional[int]):
+        self.watermark = watermark
+        self.pending = set(already_done)  # completed indices above the watermark
+        self.total = total
+        self.processed = 0
+        self.failed = 0
+        self.start = time.monotonic()
+        self._advance()
+
+    def _advance(self):
+        while self.watermark in self.pending:
+            self.pending.discard(self.watermark)
+            self.watermark += 1
+
+    def complete(self, index: int, failed: bool):
+        self.processed += 1
+        self.failed += failed
+        if index >= self.watermark:  # retried records may sit below it
+            self.pending.add(index)
+            self._advance()
+
+    def report(self):
+        elapsed = time.monotonic() - self.start
+        rate = self.processed / elapsed if elapsed else 0.0
+        line = f"processed {self.processed} ({self.failed} failed), {rate:.2f} rec/s"
+        if self.total is not None and rate:
+            remaining = max(self.total - self.watermark - len(self.pending), 0)
+            line += f", {self.watermark + len(self.pending)}/{self.total} done, ETA {remaining / rate:.0f}s"
+        print(f"📊 {line}", file=sys.stderr, flush=True)
+
+
+async def run(args) -> Progress:
+    """Stream records through a bounded worker pool into the sink"""
+    sink = open_sink(args.output)
+    watermark = sink.load_watermark()
+    already_done = sink.completed_from(watermark)
+    total = None if args.no_count else count_records(args.input, args.field)
+    retry = sink.failed() if args.retry_failed else set()
+    already_done -= retry
+    progress = Progress(watermark, already_done, total)
+    limiter = RateLimiter(args.rate)
+    queue = asyncio.Queue(maxsize=args.workers * 2)
+
+    if watermark or already_done:
+        print(f"↩️  Resuming from record {progress.watermark}", file=sys.stderr)
+    if retry:
+        print(f"🔁 Retrying {len(retry)} failed records", file=sys.stderr)
+
+    async def worker():
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            index, record_id, description, error = item
+            record = {"index": index, "id": record_id}
+            if error:
+                record["error"] = error
+            else:
+                await limiter.wait()
+                try:
+                    deadline = time.monotonic() + args.timeout if args.timeout else None
+                    record["result"] = await process_legal_case(description, deadline=deadline)
+                    reason = failure_reason(record["result"])
+                    if reason:
+                        record["error"] = reason
+                except Exception as e:
+                    record["error"] = str(e)
+            sink.write(record)
+            progress.complete(index, failed="error" in record)
+            if progress.processed % args.checkpoint_every == 0:
+                sink.save_watermark(progress.watermark)
+            if progress.processed % args.report_every == 0:
+                progress.report()
+
+    workers = [asyncio.create_task(worker()) for _ in range(args.workers)]
+    try:
+        for index, record_id, description, error in read_records(args.input, args.field):
+            if index in retry:
+                retry.discard(index)
+            elif index < progress.watermark or index in progress.pending:
+                continue
+            await queue.put((index, record_id, description, error))
+        for _ in workers:
+            await queue.put(None)
+        await asyncio.gather(*workers)
+    finally:
+        for task in workers:
+            task.cancel()
+        sink.save_watermark(progress.watermark)
+        sink.close()
+
+    progress.report()
+    return progress
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk-process FIRs through the LegalFlow workflow")
+    parser.add_argument("input", help="FIR file (.jsonl or .csv)")
+    parser.add_argument("output", help="results file (.jsonl, or .db/.sqlite for SQLite)")
+    parser.add_argument("--field", default="caseDescription", help="column/key holding the FIR text")
+    parser.add_argument("--workers", type=int, default=4, help="concurrent workflows")
+    parser.add_argument("--rate", type=float, default=None, help="max workflows started per second")
+    parser.add_argument("--timeout", type=float, default=None, help="per-record deadline in seconds")
+    parser.add_argument("--checkpoint-every", type=int, default=10, help="records between checkpoints")
+    parser.add_argument("--report-every", type=int, default=10, help="records between progress lines")
+    parser.add_argument("--no-count", action="store_true", help="skip the counting pass (no ETA)")
+    parser.add_argument("--retry-failed", action="store_true", help="re-process records written with an error")
+    parser.add_argument("--verbose", action="store_true", help="show per-agent workflow output")
+    args = parser.parse_args(argv)
+
+    # Agent logging goes to stdout; keep the terminal to progress lines unless asked
+    quiet = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(open(os.devnull, "w"))
+    with quiet:
+        progress = asyncio.run(run(args))
+    print(f"✅ Done - {progress.processed} processed, {progress.failed} failed", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+LegalFlow AI - Extraction grounding
+Deterministic check that extracted fields actually appear in the FIR text
+
+The FIR is indexed once (section citations with their offsets and a set
+of normalised word tokens), then every extracted value is validated
+against that index with set lookups, so the whole check is linear in the
+size of the FIR plus the extraction.
+"""
+
+import re
+from typing import Dict, List, Optional
+
+from statutes import parse_citation
+
+# Text fields that must be traceable to the FIR. Fields the LLM is expected
+# to infer or reformat (offenseType, firDate, evidence...) are not checked.
+GROUNDED_FIELDS = ['accusedName', 'complainant', 'address', 'location', 'policeStation', 'firNumber']
+
+# Fraction of a value's significant tokens that must occur in the FIR
+MIN_TOKEN_RATIO = 0.6
+
+# Words that carry no identifying information for matching purposes
+STOPWORDS = {
+    'the', 'of', 'and', 'at', 'in', 'near', 'road', 'police', 'station', 'ps',
+    'thana', 'mr', 'mrs', 'ms', 'shri', 'smt', 'so', 'do', 'wo', 'ro', 'son',
+    'daughter', 'wife', 'age', 'aged', 'years', 'year', 'old', 'no', 'fir'
+}
+
+# Letter suffix of a section number: "498A", "498-A", "304 - B", "498 A".
+# A detached suffix must be capitals (a single one after a plain space),
+# so "302 IPC" and "302 and 34" are not misread as suffixed sections.
+_SUFFIX = r'(?:[A-Z]+|\s*-\s*(?-i:[A-Z]{1,2})\b|\s+(?-i:[A-Z])\b)'
+_SECTION = rf'\d+{_SUFFIX}?(?:\(\d+\))?'
+_SEPARATOR = r'\s*(?:,|&|\bread\s+with\b|\br/w\b|/|\band\b)\s*(?:sections?\s+)?'
+
+# "Section 379 IPC", "Sections 498A, 323, 504 and 506 IPC", "u/s 302 r/w 34 IPC"
+_SECTION_LIST_RE = re.compile(
+    r'\b(?:sections?|secs?\.?|u/s\.?|under\s+section)\s*'
+    rf'((?:{_SECTION}(?:{_SEPARATOR})?)+)',
+    re.IGNORECASE
+)
+# "IPC 302", "IPC Section 302"
+_CODE_FIRST_RE = re.compile(rf'\b(?:IPC|BNS)\s+(?:section\s+)?(\d+{_SUFFIX}?)\b', re.IGNORECASE)
+# "302 IPC", "498A of the IPC", "420 I.P.C."
+_CODE_LAST_RE = re.compile(
+    rf'\b(\d+{_SUFFIX}?)(?:\(\d+\))?\s+(?:of\s+(?:the\s+)?)?(?:IPC|I\.P\.C|BNS|Indian\s+Penal\s+Code)\b',
+    re.IGNORECASE
+)
+_SECTION_NUMBER_RE = re.compile(rf'(\d+{_SUFFIX}?)(?:\(\d+\))?', re.IGNORECASE)
+_SUFFIX_SPACING_RE = re.compile(r'[\s-]')
+_TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+
+def _tokens(text: str) -> List[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+def _significant(tokens: List[str]) -> List[str]:
+    return [tok for tok in tokens if len(tok) > 1 and tok not in STOPWORDS]
+
+
+class FirIndex:
+    """Single-pass index of an FIR's section citations and word tokens"""
+
+    def __init__(self, text: str):
+        self.tokens = set(_tokens(text))
+        self.section_offsets: Dict[str, int] = {}
+
+        for match in _SECTION_LIST_RE.finditer(text):
+            for number in _SECTION_NUMBER_RE.finditer(match.group(1)):
+                self._add_section(number.group(1), match.start(1) + number.start())
+        for pattern in (_CODE_FIRST_RE, _CODE_LAST_RE):
+            for match in pattern.finditer(text):
+                self._add_section(match.group(1), match.start(1))
+
+    def _add_section(self, section: str, offset: int):
+        section = _SUFFIX_SPACING_RE.sub('', section).upper()
+        self.section_offsets.setdefault(section, offset)
+
+    def section_offset(self, citation: str) -> Optional[int]:
+        """Offset of the first mention of a cited section, or None"""
+        parsed = parse_citation(str(citation))
+        if parsed is None:
+            return None
+        return self.section_offsets.get(parsed[1])
+
+    def contains_value(self, value: str) -> bool:
+        """Whether enough of a value's significant tokens occur in the FIR"""
+        significant = _significant(_tokens(value))
+        if not significant:
+            return True
+        found = sum(1 for tok in significant if tok in self.tokens)
+        return found / len(significant) >= MIN_TOKEN_RATIO
+
+
+def _is_placeholder(value) -> bool:
+    return value is None or (isinstance(value, str) and (not value.strip() or value.startswith('[')))
+
+
+def check_grounding(case_description: str, extraction: dict, trusted_fields=()) -> dict:
+    """
+    Validate an extraction against the FIR it was produced from
+
+    Returns grounded and ungrounded IPC sections (with the offset of each
+    grounded section's first mention) and the list of text fields whose
+    values could not be found in the FIR. Placeholder values such as
+    "[Unknown]" and nulls are not checked.
+
+    trusted_fields are extraction fields supplied by the user rather than
+    the LLM. They are accepted as grounded (sections still get an offset
+    when the FIR mentions them) and listed under trustedFields.
+    """
+    index = FirIndex(case_description)
+    trusted = set(trusted_fields)
+
+    grounded_sections = []
+    ungrounded_sections = []
+    section_offsets = {}
+    for sec in extraction.get("ipcSections") or []:
+        offset = index.section_offset(sec)
+        if offset is not None:
+            section_offsets[sec] = offset
+        if offset is not None or "ipcSections" in trusted:
+            grounded_sections.append(sec)
+        else:
+            ungrounded_sections.append(sec)
+
+    ungrounded_fields = [
+        field for field in GROUNDED_FIELDS
+        if field not in trusted
+        and not _is_placeholder(extraction.get(field))
+        and not index.contains_value(str(extraction[field]))
+    ]
+
+    return {
+        "isGrounded": not ungrounded_sections and not ungrounded_fields,
+        "groundedSections": grounded_sections,
+        "ungroundedSections": ungrounded_sections,
+        "ungroundedFields": ungrounded_fields,
+        "sectionOffsets": section_offsets,
+        "trustedFields": sorted(trusted)
+    }
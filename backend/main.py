@@ -3,19 +3,49 @@ LegalFlow AI - FastAPI Backend with LangGraph
 Multi-agent legal workflow system
 """
 
-from fastapi import FastAPI, HTTPException
+import asyncio
+import hmac
+import json
+import math
+import time
+from contextlib import asynccontextmanager
+from typing import Optional
+from fastapi import FastAPI, HTTPException, Request, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, FileResponse
+from pydantic import BaseModel, Field, ValidationError
 from agents import process_legal_case
+from sessions import session_store, apply_message, run_action, ACTIONS, LLM_ACTIONS
+from profiling import should_profile, profile_request, profile_span, profile_store
 import os
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Brotli is optional - fall back to gzip-only compression when not installed
+try:
+    from brotli_asgi import BrotliMiddleware
+except ImportError:
+    BrotliMiddleware = None
+
+# Token required by /api/admin endpoints; they are disabled when unset
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+
+# Default time budget for a case when the client does not send one
+REQUEST_DEADLINE_SECONDS = float(os.getenv("REQUEST_DEADLINE_SECONDS", 60))
+
+# How often to check whether the client is still connected
+DISCONNECT_POLL_INTERVAL = 0.5
+
+# Responses smaller than this are not worth compressing
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", 1024))
+
 app = FastAPI(
     title="LegalFlow AI API",
     description="Multi-agent legal workflow system with hallucination prevention",
-    version="2.0.0"
+    version="2.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware for frontend
@@ -27,18 +57,49 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Negotiated response compression (br when available, otherwise gzip)
+if BrotliMiddleware is not None:
+    app.add_middleware(BrotliMiddleware, minimum_size=COMPRESSION_MIN_SIZE, gzip_fallback=True)
+else:
+    app.add_middleware(GZipMiddleware, minimum_size=COMPRESSION_MIN_SIZE)
+
 
 # Request/Response models
 class CaseRequest(BaseModel):
     caseDescription: str
+    timeoutSeconds: Optional[float] = Field(None, gt=0)
 
 
 class ExtractionResult(BaseModel):
     accusedName: str
+    age: Optional[str] = None
+    address: Optional[str] = None
     ipcSections: list[str]
     location: str
     policeStation: str
     offenseType: str
+    firNumber: Optional[str] = None
+    firDate: Optional[str] = None
+    complainant: Optional[str] = None
+    propertyValue: Optional[str] = None
+    evidence: Optional[str] = None
+    arrestStatus: Optional[str] = None
+
+
+class GroundingResult(BaseModel):
+    isGrounded: bool
+    groundedSections: list[str]
+    ungroundedSections: list[str]
+    ungroundedFields: list[str]
+    sectionOffsets: dict[str, int]
+    trustedFields: list[str] = []
+
+
+class SectionDetail(BaseModel):
+    section: str
+    name: str
+    severity: str
+    category: str
 
 
 class VerificationResult(BaseModel):
@@ -46,19 +107,200 @@ class VerificationResult(BaseModel):
     message: str
     validSections: list[str]
     invalidSections: list[str]
+    unverifiedSections: list[str] = []
     reliabilityScore: int
+    validDetails: Optional[list[SectionDetail]] = None
 
 
 class RiskResult(BaseModel):
     score: int
     level: str
+    maxSeverity: Optional[str] = None
 
 
 class CaseResponse(BaseModel):
     extraction: ExtractionResult
+    grounding: Optional[GroundingResult] = None
     draft: str
     verification: VerificationResult
     risk: RiskResult
+    degraded: bool = False
+    skippedNodes: list[str] = []
+
+
+# Bulky fields dropped from compact responses unless explicitly requested
+COMPACT_EXCLUDE = {
+    "verification": {"validDetails"},
+    "grounding": {"sectionOffsets"},
+}
+
+
+def serialize_case_response(result: dict, compact: bool = False, include: Optional[str] = None) -> dict:
+    """
+    Validate a workflow result and dump it to plain JSON-ready data
+
+    In compact mode, bulky fields in COMPACT_EXCLUDE and unset optional
+    fields are omitted. `include` is a comma-separated list of excluded
+    field names to send back anyway (e.g. "validDetails").
+    """
+    response = CaseResponse.model_validate(result)
+    if not compact:
+        return response.model_dump()
+
+    requested = {name.strip() for name in include.split(",")} if include else set()
+    exclude = {
+        key: fields - requested
+        for key, fields in COMPACT_EXCLUDE.items()
+        if fields - requested
+    }
+    return response.model_dump(exclude=exclude, exclude_none=True)
+
+
+class AdmissionController:
+    """
+    Bounds concurrent workflows on /api/process-case
+
+    Up to max_in_flight workflows run at once and up to max_queue more wait
+    for a slot; anything beyond that is shed with 429 + Retry-After. When
+    the queue is deep or recent workflows are slow, admitted requests are
+    flagged as degraded so they skip the drafting LLM call.
+    """
+
+    def __init__(self, max_in_flight: int, max_queue: int, queue_timeout: float,
+                 degrade_queue_depth: int, degrade_latency: float):
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.degrade_queue_depth = degrade_queue_depth
+        self.degrade_latency = degrade_latency
+        self._slots = asyncio.Semaphore(max_in_flight)
+
+        self.in_flight = 0
+        self.queued = 0
+        self.latency = None  # EWMA of full workflow latency in seconds
+
+        # Cumulative counters
+        self.admitted_total = 0
+        self.queued_total = 0
+        self.shed_total = 0
+        self.degraded_total = 0
+
+    def retry_after(self) -> int:
+        """Estimate seconds until a slot frees up for a new request"""
+        latency = self.latency or 10.0
+        waves = (self.queued + self.in_flight) / self.max_in_flight
+        return max(1, math.ceil(latency * waves))
+
+    def should_degrade(self) -> bool:
+        """Whether new work should run without the drafting step"""
+        if self.queued >= self.degrade_queue_depth:
+            return True
+        return self.latency is not None and self.latency >= self.degrade_latency
+
+    def record_latency(self, seconds: float, degraded: bool = False):
+        """
+        Fold a completed workflow duration into the latency EWMA
+
+        Degraded runs make one of the two LLM calls, so their duration is
+        doubled to estimate a full run. Recording them lets the average
+        come back down while every request is being degraded.
+        """
+        if degraded:
+            seconds *= 2
+        self.latency = seconds if self.latency is None else 0.8 * self.latency + 0.2 * seconds
+
+    def _shed(self):
+        self.shed_total += 1
+        raise HTTPException(
+            status_code=429,
+            detail="Server is busy processing other cases, please retry shortly",
+            headers={"Retry-After": str(self.retry_after())}
+        )
+
+    @asynccontextmanager
+    async def admit(self, timeout: Optional[float] = None, can_degrade: bool = True):
+        """
+        Wait for a workflow slot and yield whether to run degraded
+
+        timeout caps the queue wait below queue_timeout, e.g. to the time
+        left before the request deadline. Work that cannot skip drafting
+        (can_degrade=False) is never flagged or counted as degraded.
+        """
+        # The semaphore, not in_flight, says whether a slot is free: in_flight
+        # lags a release until the woken waiter runs
+        must_wait = self._slots.locked()
+        if must_wait and self.queued >= self.max_queue:
+            self._shed()
+
+        degraded = can_degrade and self.should_degrade()
+        if must_wait:
+            self.queued += 1
+            self.queued_total += 1
+        try:
+            wait = self.queue_timeout if timeout is None else min(self.queue_timeout, timeout)
+            await asyncio.wait_for(self._slots.acquire(), timeout=max(wait, 0))
+        except asyncio.TimeoutError:
+            self._shed()
+        finally:
+            if must_wait:
+                self.queued -= 1
+
+        self.in_flight += 1
+        self.admitted_total += 1
+        if degraded:
+            self.degraded_total += 1
+        start = time.perf_counter()
+        try:
+            yield degraded
+            self.record_latency(time.perf_counter() - start, degraded)
+        finally:
+            self.in_flight -= 1
+            self._slots.release()
+
+    def metrics(self) -> dict:
+        """Current admission state and cumulative counters"""
+        return {
+            "inFlight": self.in_flight,
+            "queued": self.queued,
+            "maxInFlight": self.max_in_flight,
+            "maxQueue": self.max_queue,
+            "recentLatencySeconds": round(self.latency, 3) if self.latency is not None else None,
+            "admittedTotal": self.admitted_total,
+            "queuedTotal": self.queued_total,
+            "shedTotal": self.shed_total,
+            "degradedTotal": self.degraded_total
+        }
+
+
+admission = AdmissionController(
+    max_in_flight=int(os.getenv("ADMISSION_MAX_IN_FLIGHT", 4)),
+    max_queue=int(os.getenv("ADMISSION_MAX_QUEUE", 16)),
+    queue_timeout=float(os.getenv("ADMISSION_QUEUE_TIMEOUT", 30)),
+    degrade_queue_depth=int(os.getenv("ADMISSION_DEGRADE_QUEUE_DEPTH", 8)),
+    degrade_latency=float(os.getenv("ADMISSION_DEGRADE_LATENCY", 20))
+)
+
+
+async def run_while_connected(http_request: Request, coro):
+    """
+    Await coro, cancelling it if the client disconnects first
+
+    Cancellation stops the workflow at the next node boundary so abandoned
+    requests do not go on to make further LLM calls.
+    """
+    task = asyncio.ensure_future(coro)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=DISCONNECT_POLL_INTERVAL)
+            if done:
+                return task.result()
+            if await http_request.is_disconnected():
+                print(f"🔌 Client disconnected - cancelling workflow")
+                task.cancel()
+                raise HTTPException(status_code=499, detail="Client closed request")
+    finally:
+        if not task.done():
+            task.cancel()
 
 
 @app.get("/")
@@ -86,15 +328,28 @@ async def health_check():
 
 
 @app.post("/api/process-case", response_model=CaseResponse)
-async def process_case(request: CaseRequest):
+async def process_case(request: CaseRequest, http_request: Request,
+                       compact: bool = False, include: Optional[str] = None):
     """
     Process a legal case through the multi-agent workflow
     
     Agents:
     1. Case Intake - Extract structured data
+       (then grounded against the FIR text without an LLM call)
     2. Drafting - Generate bail application
     3. Verification - Check for hallucinations
     4. Risk Scoring - Calculate risk level
+
+    Pass `?compact=true` to omit verification details and empty optional
+    fields; `?include=validDetails` adds them back.
+
+    `timeoutSeconds` sets the request deadline (default
+    REQUEST_DEADLINE_SECONDS). Agents reached after it are skipped and
+    listed in `skippedNodes`; the workflow is cancelled if the client
+    disconnects.
+
+    With PROFILING_ENABLED, an `X-Profile: 1` header captures a profile of
+    the request (see /api/admin/profiles).
     """
     try:
         if not request.caseDescription or not request.caseDescription.strip():
@@ -103,11 +358,26 @@ async def process_case(request: CaseRequest):
         print(f"\n📨 Received case processing request")
         print(f"📝 Description length: {len(request.caseDescription)} characters")
         
-        # Process through LangGraph workflow
-        result = await process_legal_case(request.caseDescription)
+        budget = request.timeoutSeconds or REQUEST_DEADLINE_SECONDS
+        deadline = time.monotonic() + budget
         
-        return result
+        with profile_request("process-case", should_profile(http_request.headers.get("X-Profile"))):
+            # Process through LangGraph workflow once admitted
+            async with admission.admit(timeout=budget) as degraded:
+                if degraded:
+                    print(f"⚠️  Server overloaded - running without drafting")
+                result = await run_while_connected(
+                    http_request,
+                    process_legal_case(request.caseDescription, degraded=degraded, deadline=deadline)
+                )
+            
+            with profile_span("serialize"):
+                payload = serialize_case_response(result, compact, include)
         
+        return ORJSONResponse(payload)
+        
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"❌ Error processing case: {e}")
         raise HTTPException(
@@ -116,6 +386,161 @@ async def process_case(request: CaseRequest):
         )
 
 
+def session_message_error(message, state: dict) -> Optional[str]:
+    """Validate a session message, returning an error to send back or None"""
+    if not isinstance(message, dict):
+        return "Messages must be JSON objects"
+    
+    action = message.get("action")
+    if action not in ACTIONS:
+        return f"Unknown action: {action}"
+    
+    timeout = message.get("timeoutSeconds")
+    if timeout is not None and (isinstance(timeout, bool) or not isinstance(timeout, (int, float))
+                                or not math.isfinite(timeout) or timeout <= 0):
+        return "timeoutSeconds must be a positive number"
+    
+    if action == "process":
+        description = message.get("caseDescription")
+        if not isinstance(description, str) or not description.strip():
+            return "Case description is required"
+        return None
+    
+    if not state["extraction"]:
+        return "Run 'process' first"
+    
+    if action == "update_extraction":
+        fields = message.get("fields")
+        if not isinstance(fields, dict):
+            return "fields must be an object"
+        unknown = set(fields) - set(ExtractionResult.model_fields)
+        if unknown:
+            return f"Unknown extraction fields: {', '.join(sorted(unknown))}"
+        try:
+            ExtractionResult.model_validate({**state["extraction"], **fields})
+        except ValidationError as e:
+            return f"Invalid extraction fields: {e.errors()[0]['loc'][0]}: {e.errors()[0]['msg']}"
+    return None
+
+
+@app.websocket("/api/session")
+async def case_session(websocket: WebSocket, session_id: Optional[str] = None):
+    """
+    Interactive case session over WebSocket
+
+    The server keeps the session's AgentState between messages. Client
+    messages are JSON objects with an "action":
+    - process: {"caseDescription": "..."} - run the full workflow
+    - update_extraction: {"fields": {...}} - edit extraction (edited fields are
+      trusted by grounding), re-ground and re-score
+    - redraft: regenerate the draft and re-verify it
+    - verify: re-run verification on the current draft
+
+    Results stream back as {"event": "node", "node": ..., "data": ...} per
+    agent followed by {"event": "done", ...}. "degraded": true on "done"
+    means the server was overloaded and a full run left out drafting and
+    verification. Reconnect with ?session_id=<id> to resume a session that
+    has not been evicted.
+    """
+    await websocket.accept()
+    session, resumed = session_store.get_or_create(session_id)
+    await websocket.send_json({"event": "session", "sessionId": session.id, "resumed": resumed})
+    
+    try:
+        while True:
+            try:
+                message = json.loads(await websocket.receive_text())
+            except ValueError:
+                await websocket.send_json({"event": "error", "detail": "Invalid JSON"})
+                continue
+            session_store.touch(session)
+            
+            # Connections resuming the same session take turns on its state
+            async with session.lock:
+                error = session_message_error(message, session.state)
+                if error:
+                    await websocket.send_json({"event": "error", "detail": error})
+                    continue
+                
+                action = message["action"]
+                print(f"\n🔁 Session {session.id[:8]}: {action}")
+                deadline = time.monotonic() + (message.get("timeoutSeconds") or REQUEST_DEADLINE_SECONDS)
+                
+                degraded = False
+                try:
+                    if action in LLM_ACTIONS:
+                        # A redraft is the drafting call itself, so only a full run can degrade
+                        async with admission.admit(timeout=deadline - time.monotonic(),
+                                                   can_degrade=action == "process") as degraded:
+                            # Only once admitted, so a shed request leaves the previous results intact
+                            apply_message(session.state, action, message)
+                            async for node, data in run_action(session.state, action, deadline, degraded):
+                                await websocket.send_json({"event": "node", "node": node, "data": data})
+                    else:
+                        apply_message(session.state, action, message)
+                        async for node, data in run_action(session.state, action, deadline):
+                            await websocket.send_json({"event": "node", "node": node, "data": data})
+                except HTTPException as e:
+                    await websocket.send_json({
+                        "event": "error",
+                        "detail": e.detail,
+                        "retryAfter": int((e.headers or {}).get("Retry-After", 0)) or None
+                    })
+                    continue
+                except WebSocketDisconnect:
+                    raise
+                except Exception as e:
+                    print(f"❌ Session {session.id[:8]} error: {e}")
+                    await websocket.send_json({"event": "error", "detail": f"Failed to run {action}: {str(e)}"})
+                    continue
+                finally:
+                    session_store.resize(session)
+                
+                await websocket.send_json({
+                    "event": "done",
+                    "action": action,
+                    "degraded": degraded,
+                    "skippedNodes": session.state["skipped_nodes"]
+                })
+    except WebSocketDisconnect:
+        print(f"🔌 Session {session.id[:8]} disconnected")
+
+
+@app.get("/api/metrics")
+async def get_metrics():
+    """Admission control and session metrics"""
+    return {"admission": admission.metrics(), "sessions": session_store.metrics()}
+
+
+def require_admin(http_request: Request):
+    """Reject admin requests unless ADMIN_TOKEN is configured and presented"""
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled (ADMIN_TOKEN not set)")
+    presented = http_request.headers.get("X-Admin-Token", "")
+    if not hmac.compare_digest(presented.encode(), ADMIN_TOKEN.encode()):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+
+@app.get("/api/admin/profiles")
+async def list_profiles(http_request: Request):
+    """Slowest captured request profiles, with per-node wall/CPU timings"""
+    require_admin(http_request)
+    return {"profiles": profile_store.list()}
+
+
+@app.get("/api/admin/profiles/{profile_id}")
+async def download_profile(profile_id: str, http_request: Request):
+    """Download a profile as folded stacks for flamegraph.pl/inferno/speedscope"""
+    require_admin(http_request)
+    if profile_store.get(profile_id) is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(
+        profile_store.path(profile_id),
+        media_type="text/plain",
+        filename=f"legalflow-{profile_id}.folded"
+    )
+
+
 @app.get("/api/ipc-database")
 async def get_ipc_database():
     """Get the trusted IPC database used for verification"""
@@ -138,11 +563,30 @@ async def get_ipc_database():
         "database": sections,
         "count": len(sections),
         "description": "Comprehensive IPC database for hallucination prevention",
-        "categories": list(set(info['category'] for info in VALID_IPC_DATABASE.values())),
+        "categories": VALID_IPC_DATABASE.db.categories('IPC'),
         "severityLevels": ["Critical", "High", "Medium", "Low"]
     }
 
 
+@app.get("/api/statutes/{code}/{section}")
+async def get_statute(code: str, section: str):
+    """Look up one IPC/BNS/CrPC section with its IPC <-> BNS equivalents"""
+    from statutes import parse_citation, statute_db
+    
+    parsed = parse_citation(f"{code} {section}")
+    info = statute_db.get(*parsed) if parsed else None
+    if info is None:
+        raise HTTPException(status_code=404, detail=f"Section {section} {code} not found")
+    
+    code, section = parsed
+    return {
+        "code": code,
+        "section": section,
+        **info,
+        "equivalents": list(statute_db.equivalents(code, section))
+    }
+
+
 if __name__ == "__main__":
     import uvicorn
     port = int(os.getenv("PORT", 8000))
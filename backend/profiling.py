@@ -0,0 +1,246 @@
+"""
+LegalFlow AI - Request profiling
+Opt-in sampling profiler for the /api/process-case request path
+
+When PROFILING_ENABLED is set, a request is profiled if it sends an
+`X-Profile: 1` header or is picked by PROFILE_SAMPLE_RATE. A background
+thread samples the stacks of every thread working on a profiled request
+(the event loop thread and the executor threads running agent nodes)
+every PROFILE_INTERVAL seconds, and each node records its wall and CPU
+time. The PROFILE_KEEP slowest profiles are kept in PROFILE_DIR as
+folded stacks ("frame;frame;frame count" lines) that flamegraph.pl,
+inferno and speedscope read directly.
+
+The event loop thread is shared by every request in flight, so its
+samples in a profile include stacks from other requests being served at
+the same time. Samples from executor threads are only taken while they
+run one of the profiled request's nodes.
+"""
+
+import contextvars
+import heapq
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+from functools import wraps
+from typing import Dict, List, Optional
+
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "").lower() in ("1", "true", "yes")
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", 0))
+PROFILE_INTERVAL = float(os.getenv("PROFILE_INTERVAL", 0.005))
+PROFILE_KEEP = int(os.getenv("PROFILE_KEEP", 20))
+PROFILE_DIR = os.getenv(
+    "PROFILE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "profiles")
+)
+
+_current_profile: contextvars.ContextVar = contextvars.ContextVar("current_profile", default=None)
+
+
+class RequestProfile:
+    """Samples and timings collected for one profiled request"""
+
+    def __init__(self, label: str):
+        self.id = uuid.uuid4().hex[:12]
+        self.label = label
+        self.started = time.time()
+        self.duration = 0.0
+        self.samples: Counter = Counter()
+        self.timings: List[dict] = []
+        self._threads: Dict[int, int] = {}  # thread id -> active registrations
+        self._lock = threading.Lock()
+
+    def add_thread(self, ident: int):
+        with self._lock:
+            self._threads[ident] = self._threads.get(ident, 0) + 1
+
+    def remove_thread(self, ident: int):
+        with self._lock:
+            count = self._threads.get(ident, 0) - 1
+            if count > 0:
+                self._threads[ident] = count
+            else:
+                self._threads.pop(ident, None)
+
+    def threads(self) -> List[int]:
+        with self._lock:
+            return list(self._threads)
+
+    def record(self, name: str, wall: float, cpu: Optional[float]):
+        self.timings.append({
+            "name": name,
+            "wallSeconds": round(wall, 6),
+            "cpuSeconds": round(cpu, 6) if cpu is not None else None
+        })
+
+    def summary(self) -> dict:
+        return {
+            "id": self.id,
+            "label": self.label,
+            "started": self.started,
+            "durationSeconds": round(self.duration, 6),
+            "sampleCount": sum(self.samples.values()),
+            "sampleIntervalSeconds": PROFILE_INTERVAL,
+            "timings": self.timings
+        }
+
+
+def _fold(frame) -> str:
+    """Render a frame chain root-first as a folded stack"""
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+class Sampler:
+    """Background thread sampling the threads of all active profiles"""
+
+    def __init__(self, interval: float = PROFILE_INTERVAL):
+        self.interval = interval
+        self._active: List[RequestProfile] = []
+        self._lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)
+        self._thread = None
+
+    def start(self, profile: RequestProfile):
+        with self._lock:
+            self._active.append(profile)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+                self._thread.start()
+            self._wake.notify()
+
+    def stop(self, profile: RequestProfile):
+        """Stop sampling a profile; once this returns its samples no longer change"""
+        with self._lock:
+            self._active.remove(profile)
+
+    def _run(self):
+        own = threading.get_ident()
+        while True:
+            # Each pass holds the lock, so stop() waits for a pass in progress
+            with self._lock:
+                while not self._active:
+                    self._wake.wait()
+                frames = sys._current_frames()
+                for profile in self._active:
+                    for ident in profile.threads():
+                        frame = frames.get(ident)
+                        if frame is not None and ident != own:
+                            profile.samples[_fold(frame)] += 1
+                del frames
+            time.sleep(self.interval)
+
+
+class ProfileStore:
+    """Keeps the N slowest profiles on disk as folded stack files"""
+
+    def __init__(self, directory: str = PROFILE_DIR, keep: int = PROFILE_KEEP):
+        self.directory = directory
+        self.keep = keep
+        self._heap: List[tuple] = []  # (duration, id) min-heap of kept profiles
+        self._summaries: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def path(self, profile_id: str) -> str:
+        return os.path.join(self.directory, f"{profile_id}.folded")
+
+    def add(self, profile: RequestProfile):
+        with self._lock:
+            if len(self._heap) >= self.keep:
+                if profile.duration <= self._heap[0][0]:
+                    return
+                _, evicted = heapq.heappop(self._heap)
+                self._summaries.pop(evicted, None)
+                if os.path.exists(self.path(evicted)):
+                    os.remove(self.path(evicted))
+            heapq.heappush(self._heap, (profile.duration, profile.id))
+            self._summaries[profile.id] = profile.summary()
+
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self.path(profile.id), "w", encoding="utf-8") as f:
+            for stack, count in profile.samples.most_common():
+                f.write(f"{stack} {count}\n")
+
+    def list(self) -> List[dict]:
+        """Kept profile summaries, slowest first"""
+        with self._lock:
+            return sorted(self._summaries.values(), key=lambda s: s["durationSeconds"], reverse=True)
+
+    def get(self, profile_id: str) -> Optional[dict]:
+        with self._lock:
+            return self._summaries.get(profile_id)
+
+
+sampler = Sampler()
+profile_store = ProfileStore()
+
+
+def should_profile(header_value: Optional[str]) -> bool:
+    """Whether to profile a request given its X-Profile header"""
+    if not PROFILING_ENABLED:
+        return False
+    if header_value and header_value.lower() in ("1", "true", "yes"):
+        return True
+    return PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE
+
+
+@contextmanager
+def profile_request(label: str, enabled: bool):
+    """Profile the enclosed request handling when enabled; yields the profile or None"""
+    if not enabled:
+        yield None
+        return
+
+    profile = RequestProfile(label)
+    token = _current_profile.set(profile)
+    ident = threading.get_ident()
+    profile.add_thread(ident)
+    sampler.start(profile)
+    start = time.perf_counter()
+    try:
+        yield profile
+    finally:
+        profile.duration = time.perf_counter() - start
+        sampler.stop(profile)
+        profile.remove_thread(ident)
+        _current_profile.reset(token)
+        profile_store.add(profile)
+        print(f"🔬 Profile {profile.id}: {profile.duration:.3f}s, {sum(profile.samples.values())} samples")
+
+
+@contextmanager
+def profile_span(name: str):
+    """Time a block of the current request and sample its thread, if profiled"""
+    profile = _current_profile.get()
+    if profile is None:
+        yield
+        return
+
+    ident = threading.get_ident()
+    profile.add_thread(ident)
+    wall_start = time.perf_counter()
+    cpu_start = time.thread_time()
+    try:
+        yield
+    finally:
+        profile.record(name, time.perf_counter() - wall_start, time.thread_time() - cpu_start)
+        profile.remove_thread(ident)
+
+
+def profile_node(node_name: str):
+    """Decorator timing an agent node as a span of the current request profile"""
+    def decorator(agent):
+        @wraps(agent)
+        def wrapper(*args, **kwargs):
+            with profile_span(node_name):
+                return agent(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,193 @@
+"""
+LegalFlow AI - Interactive sessions
+Server-side AgentState kept warm between WebSocket messages
+
+Each session holds the AgentState of its last run so follow-up requests
+(edit extraction fields, redraft, re-verify) only re-run the agents they
+affect. Sessions are evicted after SESSION_IDLE_SECONDS of inactivity or,
+least recently used first, when their combined size exceeds
+SESSION_MEMORY_BUDGET bytes.
+"""
+
+import asyncio
+import json
+import os
+import time
+import uuid
+from collections import OrderedDict
+from typing import AsyncIterator, Optional, Tuple
+
+from agents import (
+    AgentState,
+    case_intake_agent,
+    grounding_agent,
+    drafting_agent,
+    verification_agent,
+    risk_scoring_agent
+)
+
+SESSION_IDLE_SECONDS = float(os.getenv("SESSION_IDLE_SECONDS", 900))
+SESSION_MEMORY_BUDGET = int(os.getenv("SESSION_MEMORY_BUDGET", 64 * 1024 * 1024))
+
+# Agents in workflow order with the state key each one produces
+NODES = OrderedDict([
+    ("intake", (case_intake_agent, "extraction")),
+    ("grounding_check", (grounding_agent, "grounding")),
+    ("drafting", (drafting_agent, "draft")),
+    ("citation_check", (verification_agent, "verification")),
+    ("risk_scoring", (risk_scoring_agent, "risk")),
+])
+
+# Agents re-run by each session action
+ACTIONS = {
+    "process": ["intake", "grounding_check", "drafting", "citation_check", "risk_scoring"],
+    "update_extraction": ["grounding_check", "risk_scoring"],
+    "redraft": ["drafting", "citation_check"],
+    "verify": ["citation_check"],
+}
+
+# Actions that make LLM calls and therefore go through admission control
+LLM_ACTIONS = {"process", "redraft"}
+
+# Agents left out of a full run when admission control degrades it
+DEGRADED_SKIP = {"drafting", "citation_check"}
+
+
+def new_state(case_description: str = "") -> AgentState:
+    """Empty AgentState for a fresh session"""
+    return {
+        "case_description": case_description,
+        "extraction": {},
+        "grounding": {},
+        "draft": "",
+        "verification": {},
+        "risk": {},
+        "deadline": None,
+        "skipped_nodes": [],
+        "trusted_fields": []
+    }
+
+
+def state_size(state: AgentState) -> int:
+    """Approximate memory held by a session's state, in bytes"""
+    size = len(state["case_description"]) + len(state["draft"])
+    for key in ("extraction", "grounding", "verification", "risk"):
+        size += len(json.dumps(state[key], default=str))
+    return size
+
+
+class Session:
+    """One client's warm workflow state"""
+
+    def __init__(self, session_id: str):
+        self.id = session_id
+        self.state = new_state()
+        self.lock = asyncio.Lock()
+        self.size = 0
+        self.last_used = time.monotonic()
+
+
+class SessionStore:
+    """LRU store of sessions bounded by idle time and total state size"""
+
+    def __init__(self, idle_seconds: float = SESSION_IDLE_SECONDS,
+                 memory_budget: int = SESSION_MEMORY_BUDGET):
+        self.idle_seconds = idle_seconds
+        self.memory_budget = memory_budget
+        self._sessions: "OrderedDict[str, Session]" = OrderedDict()
+        self.total_size = 0
+        self.evicted_total = 0
+
+    def get_or_create(self, session_id: Optional[str] = None) -> Tuple[Session, bool]:
+        """Return (session, resumed) - resuming only if the id is still live"""
+        self.evict()
+        session = self._sessions.get(session_id) if session_id else None
+        if session is not None:
+            self.touch(session)
+            return session, True
+        session = Session(uuid.uuid4().hex)
+        self._sessions[session.id] = session
+        return session, False
+
+    def touch(self, session: Session):
+        session.last_used = time.monotonic()
+        if session.id in self._sessions:
+            self._sessions.move_to_end(session.id)
+        else:
+            # Evicted while its connection was still open - re-register it
+            self._sessions[session.id] = session
+            session.size = 0
+
+    def resize(self, session: Session):
+        """Recompute a session's size after its state changed, then enforce the budget"""
+        self.touch(session)
+        new_size = state_size(session.state)
+        self.total_size += new_size - session.size
+        session.size = new_size
+        self.evict(keep=session.id)
+
+    def remove(self, session_id: str):
+        session = self._sessions.pop(session_id, None)
+        if session is not None:
+            self.total_size -= session.size
+
+    def evict(self, keep: Optional[str] = None):
+        """Drop idle sessions, then least recently used ones while over budget"""
+        now = time.monotonic()
+        for session_id, session in list(self._sessions.items()):
+            # Ordered by last use, so the first live session ends the idle scan
+            if now - session.last_used < self.idle_seconds:
+                break
+            if session_id != keep:
+                self.remove(session_id)
+                self.evicted_total += 1
+
+        for session_id in list(self._sessions):
+            if self.total_size <= self.memory_budget:
+                break
+            if session_id != keep:
+                self.remove(session_id)
+                self.evicted_total += 1
+
+    def metrics(self) -> dict:
+        return {
+            "active": len(self._sessions),
+            "bytes": self.total_size,
+            "memoryBudget": self.memory_budget,
+            "evictedTotal": self.evicted_total
+        }
+
+
+def apply_message(state: AgentState, action: str, message: dict):
+    """Apply the client-supplied part of a session message to the state"""
+    if action == "process":
+        state.update(new_state(message.get("caseDescription", "")))
+    elif action == "update_extraction":
+        fields = message.get("fields") or {}
+        state["extraction"] = {**state["extraction"], **fields}
+        # Values a lawyer entered are trusted rather than re-grounded against the FIR
+        state["trusted_fields"] = sorted(set(state["trusted_fields"]) | set(fields))
+
+
+async def run_action(state: AgentState, action: str, deadline: Optional[float] = None,
+                     degraded: bool = False) -> AsyncIterator[Tuple[str, object]]:
+    """
+    Re-run the agents an action affects, yielding (node, output) as each finishes
+
+    Agents run in a worker thread and their partial updates are merged
+    into the session's state, so later actions start from the latest
+    results. A degraded full run leaves out drafting and verification.
+    """
+    state["deadline"] = deadline
+    state["skipped_nodes"] = []
+    for node in ACTIONS[action]:
+        if degraded and action == "process" and node in DEGRADED_SKIP:
+            continue
+        agent, key = NODES[node]
+        update = await asyncio.to_thread(agent, state)
+        state["skipped_nodes"] += update.pop("skipped_nodes", [])
+        state.update(update)
+        yield node, state[key]
+
+
+session_store = SessionStore()
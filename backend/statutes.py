@@ -0,0 +1,271 @@
+"""
+LegalFlow AI - Statute catalogue
+IPC, BNS and CrPC sections served from an on-disk SQLite index
+
+The catalogue is maintained as CSV under data/ and compiled into
+data/statutes.db the first time it is needed (or whenever a CSV is newer
+than the database). Lookups go straight to SQLite, so only the sections
+actually queried are materialised as Python objects.
+
+BNS rows are derived from the IPC rows through the IPC->BNS cross-mapping:
+a BNS section inherits the metadata of its most severe IPC counterpart.
+
+Rebuild manually with: python statutes.py
+"""
+
+import csv
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+from collections.abc import Mapping
+from functools import lru_cache
+from typing import Iterator, List, Optional, Tuple
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+STATUTES_CSV = os.path.join(DATA_DIR, "statutes.csv")
+IPC_BNS_CSV = os.path.join(DATA_DIR, "ipc_bns.csv")
+STATUTES_DB = os.getenv("STATUTES_DB", os.path.join(DATA_DIR, "statutes.db"))
+
+SEVERITY_RANK = {'Critical': 4, 'High': 3, 'Medium': 2, 'Low': 1}
+
+# Codes the catalogue covers only in part, with their last section number.
+# An uncatalogued section of these codes may still exist, so it is only
+# known to be invalid when it lies beyond the end of the code.
+PARTIAL_CODES = {'BNS': 358, 'CrPC': 484}
+
+# Recognised citation forms: "302", "302 IPC", "Section 302 IPC", "BNS 103", "498-A"
+_CITATION_RE = re.compile(
+    r'^(?:section\s+)?(?:(IPC|BNS|CrPC)\s+)?(\d+(?:-?[A-Z]+)?)(?:\s+(IPC|BNS|CrPC))?$',
+    re.IGNORECASE
+)
+_CODES = {'ipc': 'IPC', 'bns': 'BNS', 'crpc': 'CrPC'}
+
+
+def build_database(db_path: str = STATUTES_DB):
+    """
+    Compile the CSV catalogue into a SQLite database at db_path
+
+    Each build writes its own temp file and atomically swaps it in, so
+    processes building at the same time (server workers, bulk_ingest)
+    never see or clobber each other's partial database.
+    """
+    fd, tmp_path = tempfile.mkstemp(
+        prefix=os.path.basename(db_path) + ".", suffix=".tmp", dir=os.path.dirname(db_path) or "."
+    )
+    os.close(fd)
+    try:
+        _write_database(tmp_path)
+        # mkstemp creates the file private to its owner; the server may run as another user
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, db_path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def _write_database(path: str):
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE sections (
+            code TEXT NOT NULL,
+            section TEXT NOT NULL,
+            name TEXT NOT NULL,
+            severity TEXT NOT NULL,
+            category TEXT NOT NULL,
+            punishment TEXT NOT NULL,
+            bailable INTEGER,
+            related TEXT NOT NULL,
+            PRIMARY KEY (code, section)
+        ) WITHOUT ROWID;
+        CREATE TABLE ipc_bns (
+            ipc TEXT NOT NULL,
+            bns TEXT NOT NULL,
+            PRIMARY KEY (ipc, bns)
+        ) WITHOUT ROWID;
+        CREATE INDEX ipc_bns_by_bns ON ipc_bns (bns, ipc);
+    """)
+
+    with open(STATUTES_CSV, newline="", encoding="utf-8") as f:
+        rows = [
+            (r["code"], r["section"], r["name"], r["severity"], r["category"],
+             r["punishment"], int(r["bailable"]) if r["bailable"] else None, r["related"])
+            for r in csv.DictReader(f)
+        ]
+    conn.executemany("INSERT INTO sections VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+
+    with open(IPC_BNS_CSV, newline="", encoding="utf-8") as f:
+        mapping = [(r["ipc"], r["bns"]) for r in csv.DictReader(f)]
+    conn.executemany("INSERT INTO ipc_bns VALUES (?, ?)", mapping)
+
+    # Derive BNS rows from the most severe IPC section mapped onto each one
+    ipc_rows = {row[1]: row for row in rows if row[0] == 'IPC'}
+    ipc_to_bns = dict(mapping)
+    bns_rows = {}
+    for ipc, bns in mapping:
+        row = ipc_rows.get(ipc)
+        if row is None:
+            continue
+        current = bns_rows.get(bns)
+        if current is None or SEVERITY_RANK.get(row[3], 0) > SEVERITY_RANK.get(current[3], 0):
+            related = ' '.join(sorted({ipc_to_bns[r] for r in row[7].split() if r in ipc_to_bns} - {bns}))
+            bns_rows[bns] = ('BNS', bns) + row[2:7] + (related,)
+    conn.executemany(
+        "INSERT OR IGNORE INTO sections VALUES (?, ?, ?, ?, ?, ?, ?, ?)", bns_rows.values()
+    )
+
+    conn.commit()
+    conn.close()
+
+
+def _is_stale(db_path: str) -> bool:
+    if not os.path.exists(db_path):
+        return True
+    built = os.path.getmtime(db_path)
+    return any(
+        os.path.exists(path) and os.path.getmtime(path) > built
+        for path in (STATUTES_CSV, IPC_BNS_CSV)
+    )
+
+
+class StatuteDatabase:
+    """Lazily opened, read-only view of the compiled statute catalogue"""
+
+    def __init__(self, db_path: str = STATUTES_DB):
+        self.db_path = db_path
+        self._conn = None
+        self._lock = threading.Lock()
+        # Per-instance caches, so a discarded database is not kept alive
+        self._row = lru_cache(maxsize=4096)(self._fetch_row)
+        self._equivalents = lru_cache(maxsize=4096)(self._fetch_equivalents)
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            with self._lock:
+                if self._conn is None:
+                    if _is_stale(self.db_path):
+                        build_database(self.db_path)
+                    self._conn = sqlite3.connect(
+                        f"file:{self.db_path}?mode=ro", uri=True, check_same_thread=False
+                    )
+        return self._conn
+
+    def _fetch_row(self, code: str, section: str) -> Optional[tuple]:
+        return self.conn.execute(
+            "SELECT name, severity, category, punishment, bailable, related "
+            "FROM sections WHERE code = ? AND section = ?",
+            (code, section.upper())
+        ).fetchone()
+
+    def get(self, code: str, section: str) -> Optional[dict]:
+        """
+        Metadata for one section, or None if it is not in the catalogue
+
+        Rows are cached as immutable tuples and each call gets its own
+        dict, so callers may modify the result freely. `bailable` is None
+        for procedural sections it does not apply to.
+        """
+        row = self._row(code, section)
+        if row is None:
+            return None
+        return {
+            'name': row[0],
+            'severity': row[1],
+            'category': row[2],
+            'punishment': row[3],
+            'bailable': bool(row[4]) if row[4] is not None else None,
+            'related': row[5].split()
+        }
+
+    def contains(self, code: str, section: str) -> bool:
+        return self._row(code, section) is not None
+
+    def verify(self, code: str, section: str) -> Optional[bool]:
+        """
+        Whether a cited section exists: True if it is catalogued, False if
+        it cannot exist, None if a partly covered code may still have it
+        """
+        if self.contains(code, section):
+            return True
+        last = PARTIAL_CODES.get(code)
+        number = re.match(r'\d+', section)
+        if last is not None and number and int(number.group()) <= last:
+            return None
+        return False
+
+    def equivalents(self, code: str, section: str) -> Tuple[str, ...]:
+        """Sections in the other code mapped to this one (IPC <-> BNS)"""
+        return self._equivalents(code, section.upper())
+
+    def _fetch_equivalents(self, code: str, section: str) -> Tuple[str, ...]:
+        if code == 'IPC':
+            query = "SELECT bns FROM ipc_bns WHERE ipc = ?"
+        elif code == 'BNS':
+            query = "SELECT ipc FROM ipc_bns WHERE bns = ?"
+        else:
+            return ()
+        return tuple(row[0] for row in self.conn.execute(query, (section,)))
+
+    def sections(self, code: str) -> Iterator[str]:
+        """Stream the section numbers of one code"""
+        for row in self.conn.execute("SELECT section FROM sections WHERE code = ?", (code,)):
+            yield row[0]
+
+    def count(self, code: str) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM sections WHERE code = ?", (code,)).fetchone()[0]
+
+    def categories(self, code: str) -> List[str]:
+        rows = self.conn.execute("SELECT DISTINCT category FROM sections WHERE code = ?", (code,))
+        return [row[0] for row in rows]
+
+
+class StatuteCode(Mapping):
+    """Dict-like view of a single code, e.g. StatuteCode(db, 'IPC')['302']"""
+
+    def __init__(self, db: StatuteDatabase, code: str):
+        self.db = db
+        self.code = code
+
+    def __getitem__(self, section: str) -> dict:
+        info = self.db.get(self.code, section)
+        if info is None:
+            raise KeyError(section)
+        return info
+
+    def __contains__(self, section) -> bool:
+        return isinstance(section, str) and self.db.contains(self.code, section)
+
+    def __iter__(self) -> Iterator[str]:
+        return self.db.sections(self.code)
+
+    def __len__(self) -> int:
+        return self.db.count(self.code)
+
+
+def parse_citation(citation: str, default_code: str = 'IPC') -> Optional[Tuple[str, str]]:
+    """Split a citation like "302", "Section 103 BNS" into (code, section)"""
+    match = _CITATION_RE.match(citation.strip())
+    if match is None:
+        return None
+    code = match.group(1) or match.group(3) or default_code
+    return _CODES[code.lower()], match.group(2).replace('-', '').upper()
+
+
+def resolve_section(citation: str, default_code: str = 'IPC') -> Optional[dict]:
+    """Look up a citation in any supported code, or None if it is unknown"""
+    parsed = parse_citation(citation, default_code)
+    if parsed is None:
+        return None
+    return statute_db.get(*parsed)
+
+
+statute_db = StatuteDatabase()
+
+
+if __name__ == "__main__":
+    build_database()
+    print(f"✅ Built {STATUTES_DB}")
+    for code in ('IPC', 'BNS', 'CrPC'):
+        print(f"   {code}: {statute_db.count(code)} sections")
@@ -0,0 +1,94 @@
+from grounding import FirIndex, check_grounding
+
+
+def sections(text):
+    return set(FirIndex(text).section_offsets)
+
+
+def test_section_list_with_and():
+    assert sections("Case registered u/s 498A, 323, 504 and 506 IPC.") == {"498A", "323", "504", "506"}
+
+
+def test_read_with_separators():
+    assert sections("FIR lodged u/s 302 r/w 34 IPC") == {"302", "34"}
+    assert sections("under Section 307 read with Section 34 IPC") == {"307", "34"}
+
+
+def test_other_act_before_ipc_section():
+    text = "Section 3 of the Dowry Prohibition Act and 498A IPC"
+    assert "498A" in sections(text)
+
+
+def test_bare_number_then_code():
+    assert sections("The accused is charged with 302 IPC.") == {"302"}
+    assert sections("offence under 420 of the IPC") == {"420"}
+    assert sections("booked under 103 BNS") == {"103"}
+
+
+def test_code_then_number():
+    assert sections("charged under IPC 379") == {"379"}
+
+
+def test_subsection_number_not_indexed_as_section():
+    assert sections("u/s 191(2) BNS") == {"191"}
+
+
+def test_offsets_point_at_first_mention():
+    text = "u/s 379 IPC. Later again 379 IPC."
+    assert FirIndex(text).section_offsets["379"] == text.index("379")
+
+
+def test_check_grounding_splits_sections_and_fields():
+    fir = (
+        "FIR No. 0089/2022, PS Rohini. Complainant Priya Verma alleges that Suresh Verma "
+        "s/o Ram Prakash Verma harassed her for dowry. Registered u/s 498A and 323 IPC."
+    )
+    extraction = {
+        "accusedName": "Suresh Verma s/o Ram Prakash Verma",
+        "complainant": "Priya Verma",
+        "policeStation": "Rohini Police Station",
+        "firNumber": "0089/2022",
+        "location": "[Unknown]",
+        "ipcSections": ["498A", "Section 323 IPC", "999"],
+    }
+    result = check_grounding(fir, extraction)
+    assert result["groundedSections"] == ["498A", "Section 323 IPC"]
+    assert result["ungroundedSections"] == ["999"]
+    assert result["ungroundedFields"] == []
+    assert not result["isGrounded"]
+
+
+def test_check_grounding_flags_unknown_name():
+    fir = "Complainant Priya Verma reports theft u/s 379 IPC by Suresh Verma."
+    result = check_grounding(fir, {"accusedName": "Rakesh Sharma", "ipcSections": ["379"]})
+    assert result["ungroundedFields"] == ["accusedName"]
+    assert result["groundedSections"] == ["379"]
+
+
+def test_hyphenated_and_spaced_suffixes():
+    assert sections("booked u/s 498-A, 304-B IPC for the dowry death") == {"498A", "304B"}
+    assert sections("Sections 498 A and 304 - B IPC") == {"498A", "304B"}
+    assert sections("charged under 498-A of the IPC") == {"498A"}
+    assert sections("charged under IPC 304-B") == {"304B"}
+
+
+def test_detached_words_are_not_suffixes():
+    assert sections("u/s 302 IPC and 34 IPC") == {"302", "34"}
+    assert sections("Sections 323 - to be noted - and 504 IPC") == {"323", "504"}
+
+
+def test_hyphenated_section_does_not_ground_bare_number():
+    result = check_grounding("booked u/s 498-A IPC", {"ipcSections": ["498A", "498", "498-A"]})
+    assert result["groundedSections"] == ["498A", "498-A"]
+    assert result["ungroundedSections"] == ["498"]
+
+
+def test_trusted_fields_are_accepted_without_grounding():
+    fir = "Complainant Priya Verma reports theft u/s 379 IPC by Suresh Verma."
+    extraction = {"accusedName": "Rakesh Sharma", "ipcSections": ["379", "307"]}
+    result = check_grounding(fir, extraction, trusted_fields=["accusedName", "ipcSections"])
+    assert result["isGrounded"]
+    assert result["groundedSections"] == ["379", "307"]
+    assert result["sectionOffsets"] == {"379": fir.index("379")}
+    assert result["ungroundedFields"] == []
+    assert result["trustedFields"] == ["accusedName", "ipcSections"]
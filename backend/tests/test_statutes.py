@@ -0,0 +1,81 @@
+import gc
+import os
+import stat
+import weakref
+
+from statutes import StatuteCode, StatuteDatabase, build_database, parse_citation
+
+
+def make_db(tmp_path):
+    return StatuteDatabase(str(tmp_path / "statutes.db"))
+
+
+def test_build_leaves_no_temp_files(tmp_path):
+    build_database(str(tmp_path / "statutes.db"))
+    assert os.listdir(tmp_path) == ["statutes.db"]
+
+
+def test_built_database_is_world_readable(tmp_path):
+    build_database(str(tmp_path / "statutes.db"))
+    assert stat.S_IMODE(os.stat(tmp_path / "statutes.db").st_mode) == 0o644
+
+
+def test_caches_are_per_instance(tmp_path):
+    first = make_db(tmp_path)
+    second = make_db(tmp_path)
+    first.get("IPC", "302")
+    first.equivalents("IPC", "302")
+    assert second._row.cache_info().currsize == 0
+    assert second._equivalents.cache_info().currsize == 0
+
+    ref = weakref.ref(first)
+    del first
+    gc.collect()
+    assert ref() is None
+
+
+def test_get_returns_independent_copies(tmp_path):
+    db = make_db(tmp_path)
+    first = db.get("IPC", "302")
+    first["related"].append("999")
+    first["name"] = "changed"
+    assert db.get("IPC", "302")["name"] == "Murder"
+    assert "999" not in db.get("IPC", "302")["related"]
+
+
+def test_procedural_sections_have_no_bailable_or_severity(tmp_path):
+    info = make_db(tmp_path).get("CrPC", "439")
+    assert info["bailable"] is None
+    assert info["severity"] == ""
+
+
+def test_ipc_bns_cross_mapping(tmp_path):
+    db = make_db(tmp_path)
+    assert db.equivalents("IPC", "302") == ("103",)
+    assert set(db.equivalents("BNS", "303")) == {"378", "379"}
+    assert db.get("BNS", "103")["severity"] == "Critical"
+
+
+def test_statute_code_mapping_view(tmp_path):
+    ipc = StatuteCode(make_db(tmp_path), "IPC")
+    assert "498a" in ipc
+    assert "999" not in ipc
+    assert len(ipc) == len(list(ipc))
+
+
+def test_parse_citation_forms():
+    assert parse_citation("302") == ("IPC", "302")
+    assert parse_citation("Section 103 BNS") == ("BNS", "103")
+    assert parse_citation("crpc 439") == ("CrPC", "439")
+    assert parse_citation("Section 498-A IPC") == ("IPC", "498A")
+    assert parse_citation("not a section") is None
+
+
+def test_verify_leaves_partly_covered_codes_unverified(tmp_path):
+    db = make_db(tmp_path)
+    assert db.verify("IPC", "302") is True
+    assert db.verify("IPC", "999") is False
+    assert db.verify("CrPC", "439") is True
+    assert db.verify("CrPC", "173") is None
+    assert db.verify("CrPC", "999") is False
+    assert db.verify("BNS", "400") is False